@@ -4,20 +4,26 @@ AI调用时会汇报工作内容，用户可以提供文本反馈和/或图片
 """
 
 import io
-import base64
 import tkinter as tk
-from tkinter import filedialog, messagebox, scrolledtext, ttk
-from PIL import Image, ImageTk, ImageDraw, ImageFilter
+from tkinter import filedialog, messagebox
+import sys
 import threading
-import queue
+import traceback
+import weakref
+import struct
+import hashlib
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 from pathlib import Path
 from datetime import datetime
+from functools import lru_cache
+from types import MappingProxyType
 import os
-import math
 import re
 
 from mcp.server.fastmcp import FastMCP
 from mcp.server.fastmcp.utilities.types import Image as MCPImage
+from mcp.types import TextContent
 
 # 创建MCP服务器
 mcp = FastMCP(
@@ -29,7 +35,404 @@ mcp = FastMCP(
 DEFAULT_DIALOG_TIMEOUT = 300  # 5分钟
 DIALOG_TIMEOUT = int(os.getenv("MCP_DIALOG_TIMEOUT", DEFAULT_DIALOG_TIMEOUT))
 
+# 文字反馈输入框的占位提示
+FEEDBACK_PLACEHOLDER = "💡 请在此输入您的反馈、建议或问题...\n\n✨ 您的意见对我们非常宝贵"
+
+# 常驻的隐藏Tk根窗口：首次使用时在专用线程中创建并一直运行主循环，
+# 每个对话框只创建一个Toplevel，避免每次调用都重新初始化Tcl/Tk解释器
+_tk_root = None
+_tk_root_lock = threading.Lock()
+
+# 对话框超时后调用方额外等待的时间（秒）；Tk线程被卡住时超过这个时间就放弃等待
+DIALOG_RESULT_GRACE = 5
+
+
+def _get_tk_root():
+    """获取常驻的隐藏Tk根窗口，首次调用时启动Tk线程"""
+    global _tk_root
+    with _tk_root_lock:
+        if _tk_root is None:
+            started = Future()
+
+            def run_tk():
+                try:
+                    root = tk.Tk()
+                    root.withdraw()
+                except BaseException as e:
+                    started.set_exception(e)
+                    return
+                started.set_result(root)
+                root.mainloop()
+
+            threading.Thread(target=run_tk, name="feedback-tk", daemon=True).start()
+            _tk_root = started.result()
+    return _tk_root
+
+
+def _run_dialog(open_dialog, timeout_seconds, close_dialog):
+    """在Tk线程中打开对话框并阻塞等待结果，超时返回None
+
+    open_dialog(master, result) 在Tk线程中调用，负责创建Toplevel，
+    并在对话框关闭时通过 result.set_result() 交出结果。
+    对话框自己会在 timeout_seconds 秒后关闭；如果Tk线程被卡住（原生模态对话框、
+    回调没有返回等），调用方最多再等 DIALOG_RESULT_GRACE 秒，
+    然后安排 close_dialog() 在Tk线程中关闭对话框，不让工具调用一直阻塞。
+    """
+    root = _get_tk_root()
+    result = Future()
+
+    def start():
+        try:
+            open_dialog(root, result)
+        except BaseException as e:
+            result.set_exception(e)
+
+    root.after(0, start)
+    try:
+        # 对话框内部的异常会在这里重新抛出
+        return result.result(timeout=timeout_seconds + DIALOG_RESULT_GRACE)
+    except FutureTimeoutError:
+        try:
+            root.after(0, close_dialog)
+        except (RuntimeError, tk.TclError):
+            # Tk线程已经退出
+            pass
+        return None
+
+# MCP客户端可直接接收的图片格式（PIL格式名 -> MCP图片格式）
+MCP_IMAGE_FORMATS = {"PNG": "png", "JPEG": "jpeg", "GIF": "gif", "WEBP": "webp"}
+
+# PNG可以直接保存的图片模式
+PNG_COMPATIBLE_MODES = frozenset(("1", "L", "LA", "P", "RGB", "RGBA", "I", "I;16"))
+
+
+def _image_to_png_bytes(img):
+    """将PIL图片编码为PNG字节
+
+    数据只发送一次就丢弃，使用最低压缩级别换取更快的编码速度。
+    """
+    if img.mode not in PNG_COMPATIBLE_MODES:
+        img = img.convert("RGBA" if "A" in img.getbands() else "RGB")
+    buffer = io.BytesIO()
+    img.save(buffer, format='PNG', compress_level=1, optimize=False)
+    return buffer.getvalue()
+
+
+def _prepare_image_bytes(image_data):
+    """准备发送给MCP的图片数据
+
+    MCP支持的格式直接透传原始字节（Image.open只解析文件头，不解码像素），
+    其余格式（如BMP）才重新编码为PNG。
+
+    Returns:
+        (图片字节, MCP图片格式)
+    """
+    from PIL import Image
+
+    with Image.open(io.BytesIO(image_data)) as img:
+        image_format = MCP_IMAGE_FORMATS.get(img.format)
+        if image_format is None:
+            return _image_to_png_bytes(img), "png"
+    return image_data, image_format
+
+
+def _load_image_bytes(img_info):
+    """取出图片条目要发送的字节和格式
+
+    文件图片只记录路径，提交时才读取文件内容；剪贴板图片保留PIL对象，提交时才编码为PNG。
+
+    Returns:
+        (图片字节, MCP图片格式)
+    """
+    if 'path' in img_info:
+        with open(img_info['path'], 'rb') as f:
+            return _prepare_image_bytes(f.read())
+    return _image_to_png_bytes(img_info['image']), 'png'
+
+
+# 预览缩略图尺寸与缓存容量
+THUMBNAIL_SIZE = (140, 105)
+THUMBNAIL_CACHE_SIZE = 64
+# 预览卡片上来源文字的最大长度，超出部分用省略号代替，避免长文件名撑宽卡片
+SOURCE_LABEL_MAX = 15
+# 界面线程轮询后台图片读取结果的间隔（毫秒）
+LOAD_POLL_MS = 50
+
+
+def _display_source(source):
+    """预览卡片上显示的来源文字，在创建图片条目时计算一次"""
+    return source if len(source) <= SOURCE_LABEL_MAX else source[:SOURCE_LABEL_MAX - 1] + '…'
+
+
+# 缩略图缓存：(文件路径, 修改时间, 尺寸) -> PIL缩略图，按LRU淘汰
+# 缓存是模块级共享的，访问时加锁
+_thumbnail_cache = OrderedDict()
+_thumbnail_cache_lock = threading.Lock()
+
+
+def _fit_thumbnail(img, size):
+    """按比例缩小到size以内，直接resize生成新图，不先复制整张原图"""
+    from PIL import Image
+
+    scale = min(size[0] / img.width, size[1] / img.height, 1)
+    fitted = (max(1, round(img.width * scale)), max(1, round(img.height * scale)))
+    # 先用box滤波快速缩小到目标尺寸的两倍左右，再做一次BILINEAR；
+    # 140x105的预览图上与LANCZOS看不出差别，但快得多（提交的原图不经过缩放）
+    return img.resize(fitted, Image.Resampling.BILINEAR, reducing_gap=2.0)
+
+
+def _create_thumbnail(img_info, size=THUMBNAIL_SIZE):
+    """生成图片预览缩略图，文件图片按路径和修改时间缓存，避免重复选择同一文件时重新解码缩放"""
+    if 'path' not in img_info:
+        # 剪贴板图片已在内存中，直接缩放（PhotoImage已缓存在条目上，不会重复生成）
+        return _fit_thumbnail(img_info['image'], size)
+
+    key = (img_info['path'], img_info['mtime'], size)
+    with _thumbnail_cache_lock:
+        thumbnail = _thumbnail_cache.get(key)
+        if thumbnail is not None:
+            _thumbnail_cache.move_to_end(key)
+            return thumbnail
+
+    from PIL import Image
+
+    # 直接从文件解码；JPEG让libjpeg按1/2、1/4、1/8比例缩小解码，跳过大部分全尺寸解码
+    # （保留两倍目标尺寸，给后面的缩放留出抗锯齿余量）
+    with Image.open(img_info['path']) as source:
+        source.draft('RGB', (size[0] * 2, size[1] * 2))
+        thumbnail = _fit_thumbnail(source, size)
+
+    with _thumbnail_cache_lock:
+        _thumbnail_cache[key] = thumbnail
+        if len(_thumbnail_cache) > THUMBNAIL_CACHE_SIZE:
+            _thumbnail_cache.popitem(last=False)
+    return thumbnail
+
+
+def _load_image_file(file_path):
+    """读取图片文件信息并生成缩略图（在后台线程中执行）"""
+    from PIL import Image
+
+    # 只读取文件头验证图片并获取尺寸，文件内容等到提交时再读取
+    with Image.open(file_path) as img:
+        size = img.size
+    mtime = os.stat(file_path).st_mtime_ns
+    source = f'文件: {Path(file_path).name}'
+    img_info = {
+        'path': file_path,
+        'mtime': mtime,
+        # 同一个文件（路径和修改时间都相同）视为同一张图片
+        'key': (os.path.normcase(os.path.abspath(file_path)), mtime),
+        'source': source,
+        'display_source': _display_source(source),
+        'size': size
+    }
+    img_info['thumbnail'] = _create_thumbnail(img_info)
+    return img_info
+
+
+# PNG 8位色深下颜色类型与PIL模式的对应关系
+_PNG_COLOR_TYPE_MODES = {0: "L", 2: "RGB", 3: "P", 4: "LA", 6: "RGBA"}
+
+# JPEG 颜色分量数与PIL模式的对应关系
+_JPEG_COMPONENT_MODES = {1: "L", 3: "RGB", 4: "CMYK"}
+
+# JPEG 帧起始标记（SOF0-SOF15，排除DHT/JPG/DAC）
+_JPEG_SOF_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
+# JPEG 不带长度字段的标记（TEM、RST0-7、SOI、EOI）以及填充字节
+_JPEG_STANDALONE_MARKERS = frozenset(range(0xD0, 0xDA)) | {0x01, 0xFF}
+
+
+def _read_image_header(f):
+    """直接解析PNG/JPEG文件头获取格式、尺寸和模式，不创建PIL图片对象
+
+    Returns:
+        (格式, 宽, 高, 模式)，无法识别时返回None，由调用方回退到PIL
+    """
+    head = f.read(26)
+
+    if head[:8] == b"\x89PNG\r\n\x1a\n" and head[12:16] == b"IHDR":
+        width, height, bit_depth, color_type = struct.unpack(">IIBB", head[16:26])
+        mode = _PNG_COLOR_TYPE_MODES.get(color_type)
+        if bit_depth != 8 or mode is None:
+            return None
+        return "PNG", width, height, mode
+
+    if head[:2] == b"\xff\xd8":
+        # 逐段跳过，直到遇到SOF段
+        f.seek(2)
+        while True:
+            marker = f.read(4)
+            # 填充字节、独立标记等少见结构交给PIL处理
+            if len(marker) < 4 or marker[0] != 0xFF or marker[1] in _JPEG_STANDALONE_MARKERS:
+                return None
+            segment_length = struct.unpack(">H", marker[2:4])[0]
+            if marker[1] in _JPEG_SOF_MARKERS:
+                frame = f.read(6)
+                if len(frame) < 6:
+                    return None
+                _, height, width, components = struct.unpack(">BHHB", frame)
+                mode = _JPEG_COMPONENT_MODES.get(components)
+                if mode is None:
+                    return None
+                return "JPEG", width, height, mode
+            f.seek(segment_length - 2, os.SEEK_CUR)
+
+    return None
+
+
+# Markdown内联格式与有序列表的正则（预编译，避免每行重复查找/编译）
+# 内联格式合并为一个交替正则，一次从左到右扫描；分组名即文本标签，粗体排在斜体前面优先匹配
+_INLINE_RE = re.compile(r'\*\*(?P<bold>.*?)\*\*|\*(?P<italic>.*?)\*|`(?P<code>.*?)`')
+_OLIST_RE = re.compile(r'^(\d+)\. (.*)$')
+
+# 标题级别 -> (图标前缀, 文本标签)
+_HEADING_STYLES = {1: ("🎯 ", "h1"), 2: ("✨ ", "h2"), 3: ("🔧 ", "h3"), 4: ("📋 ", "h4")}
+# 分隔线的渲染结果是固定的
+_SEPARATOR_TOKENS = ('\n', "normal", '━' * 60 + '\n', "separator", '\n', "normal")
+
+
+# Markdown逐行解析：纯函数，输入一行源文本，输出 文本, 标签, 文本, 标签... 交替排列的元组，
+# 与Text组件无关，渲染器只负责把结果插入组件
+def _inline_tokens(text, out, default_tag="normal"):
+    """处理内联格式（粗体、斜体、代码）"""
+    # 没有格式标记的行（大多数行）不需要正则扫描
+    if '*' not in text and '`' not in text:
+        out += (text, default_tag)
+        return
+
+    current_pos = 0
+
+    # 一次扫描找出所有不重叠的格式，较早出现的格式优先
+    for match in _INLINE_RE.finditer(text):
+        start = match.start()
+        # 添加前面的普通文本
+        if start > current_pos:
+            out += (text[current_pos:start], default_tag)
+        # 添加格式化文本（只插入非空文本）
+        tag = match.lastgroup
+        content = match.group(tag)
+        if content:
+            out += (content, tag)
+        current_pos = match.end()
+
+    # 添加剩余的普通文本
+    if current_pos < len(text):
+        out += (text[current_pos:], default_tag)
+
+
+def _heading_tokens(line, out):
+    """标题 - 支持更多级别和美化"""
+    level = len(line) - len(line.lstrip('#'))
+    style = _HEADING_STYLES.get(level)
+    if style is None or line[level:level + 1] != ' ':
+        return False
+    icon, tag = style
+    out += (icon, tag, line[level + 1:] + '\n', tag)
+    return True
+
+
+def _list_item_tokens(line, out):
+    """美化列表（包括任务列表）"""
+    if line[1:2] != ' ':
+        return False
+    # 美化任务列表
+    if line.startswith(('- [ ]', '- [x]')):
+        checkbox = '☐' if line[3] == ' ' else '✅'
+        _inline_tokens(f"    {checkbox} {line[5:].strip()}\n", out, "list")
+    else:
+        _inline_tokens(f"  ▸ {line[2:]}\n", out, "list")
+    return True
+
+
+def _quote_tokens(line, out):
+    """美化引用"""
+    if line[1:2] != ' ':
+        return False
+    _inline_tokens(f"💭 {line[2:]}\n", out, "quote")
+    return True
+
+
+# 代码块结束边框
+_CODE_FENCE_CLOSE_TOKENS = ('└' + '─' * 58 + '┘\n\n', "code")
+
+
+def _code_fence_tokens(line):
+    """美化代码块起始边框"""
+    lang = line[3:].strip()
+    if lang:
+        return (f"\n┌─ 📝 {lang.upper()} " + '─' * (50 - len(lang)) + '┐\n', "code")
+    return ('\n┌─ 💻 CODE ' + '─' * 47 + '┐\n', "code")
+
+
+# 行首字符 -> 块级语法处理函数；处理函数返回True表示已处理该行
+# 代码块边框需要知道是否处于代码块内，由render()处理
+_PREFIX_HANDLERS = {
+    '#': _heading_tokens,
+    '-': _list_item_tokens,
+    '*': _list_item_tokens,
+    '>': _quote_tokens,
+}
+
+
+@lru_cache(maxsize=2048)
+def _markdown_line_tokens(line):
+    """渲染单行文本 - 美化版本
+
+    结果只取决于该行内容，按行缓存：重复打开对话框或内容大部分不变时直接复用。
+    """
+    out = []
+    stripped = line.strip()
+
+    # 美化分隔线
+    if stripped in ('---', '***', '___'):
+        return _SEPARATOR_TOKENS
+
+    # 标题、列表、引用：按行首字符查表分派，不再逐个startswith
+    handler = _PREFIX_HANDLERS.get(line[:1])
+    if handler is not None and handler(line, out):
+        return tuple(out)
+
+    # 美化有序列表
+    match = _OLIST_RE.match(line)
+    if match:
+        _inline_tokens(f"  {match.group(1)}. {match.group(2)}\n", out, "list")
+    # 美化表格
+    elif '|' in line and line.count('|') >= 2:
+        formatted_line = line.replace('|', ' │ ').strip()
+        out += (f"  {formatted_line}\n", "table")
+    # 空行
+    elif not stripped:
+        out += ('\n', "normal")
+    # 普通文本（处理内联格式）
+    else:
+        _inline_tokens(line + '\n', out)
+    return tuple(out)
+
+
 # 简单的Markdown渲染器
+@lru_cache(maxsize=32)
+def _markdown_tokens(markdown_text):
+    """解析整篇Markdown文档
+
+    各行的渲染结果收集到一个 文本, 标签, 文本, 标签... 交替排列的元组里。
+    按文档内容缓存：同一汇报内容再次打开对话框时不再解析。
+    代码块内的行原样显示，不做任何格式解析。
+    """
+    out = []
+    in_code_block = False
+    for line in markdown_text.split('\n'):
+        if line.startswith('```'):
+            out += _CODE_FENCE_CLOSE_TOKENS if in_code_block else _code_fence_tokens(line)
+            in_code_block = not in_code_block
+        elif in_code_block:
+            out += (line + '\n', "code")
+        else:
+            out += _markdown_line_tokens(line)
+    return tuple(out)
+
+
 class SimpleMarkdownRenderer:
     """简单的Markdown渲染器，用于在tkinter Text组件中显示格式化文本"""
 
@@ -38,221 +441,135 @@ class SimpleMarkdownRenderer:
         self.theme = theme
         self.setup_tags()
 
+    # 标签样式只依赖主题常量，按主题缓存解析好的 (标签名, 选项) 列表，新建渲染器时直接复用
+    _TAG_SPECS = {}
+
     def setup_tags(self):
         """设置文本标签样式 - 现代化Markdown渲染优化版本"""
-        # 一级标题 - 主要标题，更大更醒目
-        self.text_widget.tag_configure("h1",
-            font=(self.theme.FONT_FAMILY_PRIMARY, self.theme.FONT_SIZE_2XL, "bold"),
-            foreground=self.theme.PRIMARY_LIGHT,
-            spacing1=self.theme.SPACING_LG,  # 增加上间距
-            spacing3=self.theme.SPACING_MD,  # 增加下间距
-            justify=tk.LEFT)
-
-        # 二级标题 - 章节标题，醒目的颜色
-        self.text_widget.tag_configure("h2",
-            font=(self.theme.FONT_FAMILY_PRIMARY, self.theme.FONT_SIZE_XL, "bold"),
-            foreground=self.theme.SECONDARY_LIGHT,
-            spacing1=self.theme.SPACING_MD,  # 增加上间距
-            spacing3=self.theme.SPACING_SM,  # 增加下间距
-            justify=tk.LEFT)
-
-        # 三级标题 - 子章节标题
-        self.text_widget.tag_configure("h3",
-            font=(self.theme.FONT_FAMILY_PRIMARY, self.theme.FONT_SIZE_LG, "bold"),
-            foreground=self.theme.SUCCESS_LIGHT,
-            spacing1=self.theme.SPACING_SM,  # 增加上间距
-            spacing3=self.theme.SPACING_SM,  # 增加下间距
-            justify=tk.LEFT)
-
-        # 四级标题 - 小节标题
-        self.text_widget.tag_configure("h4",
-            font=(self.theme.FONT_FAMILY_PRIMARY, self.theme.FONT_SIZE_BASE, "bold"),
-            foreground=self.theme.WARNING_LIGHT,
-            spacing1=self.theme.SPACING_SM,  # 增加上间距
-            spacing3=self.theme.SPACING_XS,  # 增加下间距
-            justify=tk.LEFT)
-
-        # 粗体和斜体 - 调整字体大小
-        self.text_widget.tag_configure("bold",
-            font=(self.theme.FONT_FAMILY_SECONDARY, self.theme.FONT_SIZE_SM, "bold"),
-            foreground=self.theme.PRIMARY_LIGHT)
-
-        self.text_widget.tag_configure("italic",
-            font=(self.theme.FONT_FAMILY_SECONDARY, self.theme.FONT_SIZE_SM, "italic"),
-            foreground=self.theme.SECONDARY_LIGHT)
-
-        # 代码样式 - 移除边框，简化设计
-        self.text_widget.tag_configure("code",
-            font=(self.theme.FONT_FAMILY_MONO, self.theme.FONT_SIZE_XS),
-            foreground=self.theme.SUCCESS_LIGHT,
-            background=self.theme.BACKGROUND_TERTIARY)
-
-        # 列表样式 - 现代化列表设计，更好的间距和视觉层次
-        self.text_widget.tag_configure("list",
-            font=(self.theme.FONT_FAMILY_SECONDARY, self.theme.FONT_SIZE_SM),
-            foreground=self.theme.TEXT_PRIMARY,
-            lmargin1=self.theme.SPACING_LG,  # 增加左边距
-            lmargin2=self.theme.SPACING_XL,  # 增加续行缩进
-            spacing1=self.theme.SPACING_XS,  # 增加列表项间距
-            spacing3=self.theme.SPACING_XS)
-
-        # 引用样式 - 现代化引用块设计，更醒目的视觉效果
-        self.text_widget.tag_configure("quote",
-            font=(self.theme.FONT_FAMILY_SECONDARY, self.theme.FONT_SIZE_SM, "italic"),
-            foreground=self.theme.SECONDARY_LIGHT,
-            lmargin1=self.theme.SPACING_LG,  # 增加左边距
-            lmargin2=self.theme.SPACING_LG,  # 保持一致的缩进
-            rmargin=self.theme.SPACING_MD,   # 增加右边距
-            spacing1=self.theme.SPACING_SM,  # 增加上间距
-            spacing3=self.theme.SPACING_SM,  # 增加下间距
-            background=self.theme.BACKGROUND_TERTIARY)
-
-        # 普通文本 - 调整字体大小
-        self.text_widget.tag_configure("normal",
-            font=(self.theme.FONT_FAMILY_SECONDARY, self.theme.FONT_SIZE_SM),
-            foreground=self.theme.TEXT_PRIMARY)
-
-        # 分隔线样式 - 调整字体大小
-        self.text_widget.tag_configure("separator",
-            font=(self.theme.FONT_FAMILY_PRIMARY, self.theme.FONT_SIZE_XS),
-            foreground=self.theme.BORDER_DEFAULT,
-            justify=tk.CENTER)
-
-        # 强调文本 - 调整字体大小
-        self.text_widget.tag_configure("emphasis",
-            font=(self.theme.FONT_FAMILY_PRIMARY, self.theme.FONT_SIZE_SM, "bold"),
-            foreground=self.theme.PRIMARY_LIGHT)
-
-        # 链接样式 - 调整字体大小
-        self.text_widget.tag_configure("link",
-            font=(self.theme.FONT_FAMILY_SECONDARY, self.theme.FONT_SIZE_SM, "underline"),
-            foreground=self.theme.SECONDARY_LIGHT)
-
-        # 表格样式 - 调整字体大小
-        self.text_widget.tag_configure("table",
-            font=(self.theme.FONT_FAMILY_MONO, self.theme.FONT_SIZE_XS),
-            foreground=self.theme.TEXT_PRIMARY,
-            background=self.theme.BACKGROUND_TERTIARY)
+        specs = SimpleMarkdownRenderer._TAG_SPECS.get(self.theme)
+        if specs is None:
+            specs = SimpleMarkdownRenderer._TAG_SPECS[self.theme] = self._build_tag_specs(self.theme)
+        for name, options in specs:
+            self.text_widget.tag_configure(name, **options)
 
-    def render(self, markdown_text):
-        """渲染Markdown文本到Text组件"""
-        self.text_widget.config(state=tk.NORMAL)
-        self.text_widget.delete(1.0, tk.END)
+    @staticmethod
+    def _build_tag_specs(theme):
+        """根据主题生成所有文本标签的样式"""
+        return (
+            # 一级标题 - 主要标题，更大更醒目
+            ("h1", dict(
+                font=(theme.FONT_FAMILY_PRIMARY, theme.FONT_SIZE_2XL, "bold"),
+                foreground=theme.PRIMARY_LIGHT,
+                spacing1=theme.SPACING_LG,  # 增加上间距
+                spacing3=theme.SPACING_MD,  # 增加下间距
+                justify=tk.LEFT)),
+
+            # 二级标题 - 章节标题，醒目的颜色
+            ("h2", dict(
+                font=(theme.FONT_FAMILY_PRIMARY, theme.FONT_SIZE_XL, "bold"),
+                foreground=theme.SECONDARY_LIGHT,
+                spacing1=theme.SPACING_MD,  # 增加上间距
+                spacing3=theme.SPACING_SM,  # 增加下间距
+                justify=tk.LEFT)),
+
+            # 三级标题 - 子章节标题
+            ("h3", dict(
+                font=(theme.FONT_FAMILY_PRIMARY, theme.FONT_SIZE_LG, "bold"),
+                foreground=theme.SUCCESS_LIGHT,
+                spacing1=theme.SPACING_SM,  # 增加上间距
+                spacing3=theme.SPACING_SM,  # 增加下间距
+                justify=tk.LEFT)),
+
+            # 四级标题 - 小节标题
+            ("h4", dict(
+                font=(theme.FONT_FAMILY_PRIMARY, theme.FONT_SIZE_BASE, "bold"),
+                foreground=theme.WARNING_LIGHT,
+                spacing1=theme.SPACING_SM,  # 增加上间距
+                spacing3=theme.SPACING_XS,  # 增加下间距
+                justify=tk.LEFT)),
+
+            # 粗体和斜体 - 调整字体大小
+            ("bold", dict(
+                font=(theme.FONT_FAMILY_SECONDARY, theme.FONT_SIZE_SM, "bold"),
+                foreground=theme.PRIMARY_LIGHT)),
+
+            ("italic", dict(
+                font=(theme.FONT_FAMILY_SECONDARY, theme.FONT_SIZE_SM, "italic"),
+                foreground=theme.SECONDARY_LIGHT)),
+
+            # 代码样式 - 移除边框，简化设计
+            ("code", dict(
+                font=(theme.FONT_FAMILY_MONO, theme.FONT_SIZE_XS),
+                foreground=theme.SUCCESS_LIGHT,
+                background=theme.BACKGROUND_TERTIARY)),
+
+            # 列表样式 - 现代化列表设计，更好的间距和视觉层次
+            ("list", dict(
+                font=(theme.FONT_FAMILY_SECONDARY, theme.FONT_SIZE_SM),
+                foreground=theme.TEXT_PRIMARY,
+                lmargin1=theme.SPACING_LG,  # 增加左边距
+                lmargin2=theme.SPACING_XL,  # 增加续行缩进
+                spacing1=theme.SPACING_XS,  # 增加列表项间距
+                spacing3=theme.SPACING_XS)),
+
+            # 引用样式 - 现代化引用块设计，更醒目的视觉效果
+            ("quote", dict(
+                font=(theme.FONT_FAMILY_SECONDARY, theme.FONT_SIZE_SM, "italic"),
+                foreground=theme.SECONDARY_LIGHT,
+                lmargin1=theme.SPACING_LG,  # 增加左边距
+                lmargin2=theme.SPACING_LG,  # 保持一致的缩进
+                rmargin=theme.SPACING_MD,   # 增加右边距
+                spacing1=theme.SPACING_SM,  # 增加上间距
+                spacing3=theme.SPACING_SM,  # 增加下间距
+                background=theme.BACKGROUND_TERTIARY)),
+
+            # 普通文本 - 调整字体大小
+            ("normal", dict(
+                font=(theme.FONT_FAMILY_SECONDARY, theme.FONT_SIZE_SM),
+                foreground=theme.TEXT_PRIMARY)),
+
+            # 分隔线样式 - 调整字体大小
+            ("separator", dict(
+                font=(theme.FONT_FAMILY_PRIMARY, theme.FONT_SIZE_XS),
+                foreground=theme.BORDER_DEFAULT,
+                justify=tk.CENTER)),
+
+            # 强调文本 - 调整字体大小
+            ("emphasis", dict(
+                font=(theme.FONT_FAMILY_PRIMARY, theme.FONT_SIZE_SM, "bold"),
+                foreground=theme.PRIMARY_LIGHT)),
+
+            # 链接样式 - 调整字体大小
+            ("link", dict(
+                font=(theme.FONT_FAMILY_SECONDARY, theme.FONT_SIZE_SM, "underline"),
+                foreground=theme.SECONDARY_LIGHT)),
+
+            # 表格样式 - 调整字体大小
+            ("table", dict(
+                font=(theme.FONT_FAMILY_MONO, theme.FONT_SIZE_XS),
+                foreground=theme.TEXT_PRIMARY,
+                background=theme.BACKGROUND_TERTIARY)),
+        )
 
-        lines = markdown_text.split('\n')
+    def render(self, markdown_text):
+        """渲染Markdown文本到Text组件
 
-        for line in lines:
-            self._render_line(line)
+        解析结果按文档缓存（见_markdown_tokens），整篇文档只调用一次insert。
+        """
+        out = _markdown_tokens(markdown_text)
 
+        self.text_widget.config(state=tk.NORMAL)
+        self.text_widget.delete(1.0, tk.END)
+        if out:
+            self.text_widget.insert(tk.END, *out)
         self.text_widget.config(state=tk.DISABLED)
 
-    def _render_line(self, line):
-        """渲染单行文本 - 美化版本"""
-        # 标题 - 支持更多级别和美化
-        if line.startswith('# '):
-            self.text_widget.insert(tk.END, f"🎯 {line[2:]}\n", "h1")
-        elif line.startswith('## '):
-            self.text_widget.insert(tk.END, f"✨ {line[3:]}\n", "h2")
-        elif line.startswith('### '):
-            self.text_widget.insert(tk.END, f"🔧 {line[4:]}\n", "h3")
-        elif line.startswith('#### '):
-            self.text_widget.insert(tk.END, f"📋 {line[5:]}\n", "h4")
-        # 美化分隔线
-        elif line.strip() in ['---', '***', '___']:
-            self.text_widget.insert(tk.END, '\n', "normal")
-            self.text_widget.insert(tk.END, '━' * 60 + '\n', "separator")
-            self.text_widget.insert(tk.END, '\n', "normal")
-        # 美化列表
-        elif line.startswith('- ') or line.startswith('* '):
-            self._render_inline_formatting(f"  ▸ {line[2:]}\n", "list")
-        elif re.match(r'^\d+\. ', line):
-            match = re.match(r'^(\d+)\. (.*)$', line)
-            if match:
-                self._render_inline_formatting(f"  {match.group(1)}. {match.group(2)}\n", "list")
-        # 美化引用
-        elif line.startswith('> '):
-            self._render_inline_formatting(f"💭 {line[2:]}\n", "quote")
-        # 美化代码块
-        elif line.startswith('```'):
-            if line.strip() == '```':
-                self.text_widget.insert(tk.END, '└' + '─' * 58 + '┘\n\n', "code")
-            else:
-                lang = line[3:].strip()
-                if lang:
-                    self.text_widget.insert(tk.END, f"\n┌─ 📝 {lang.upper()} " + '─' * (50 - len(lang)) + '┐\n', "code")
-                else:
-                    self.text_widget.insert(tk.END, '\n┌─ 💻 CODE ' + '─' * 47 + '┐\n', "code")
-        # 美化表格
-        elif '|' in line and line.count('|') >= 2:
-            formatted_line = line.replace('|', ' │ ').strip()
-            self.text_widget.insert(tk.END, f"  {formatted_line}\n", "table")
-        # 美化任务列表
-        elif line.startswith('- [ ]') or line.startswith('- [x]'):
-            checkbox = '☐' if '[ ]' in line else '✅'
-            content = line[5:].strip()
-            self._render_inline_formatting(f"    {checkbox} {content}\n", "list")
-        # 空行
-        elif line.strip() == '':
-            self.text_widget.insert(tk.END, '\n', "normal")
-        # 普通文本（处理内联格式）
-        else:
-            self._render_inline_formatting(line + '\n')
-
-    def _render_inline_formatting(self, text, default_tag="normal"):
-        """处理内联格式（粗体、斜体、代码）"""
-        # 更完善的内联格式处理
-        parts = []
-        current_pos = 0
-
-        # 按优先级处理各种格式
-        patterns = [
-            (r'\*\*(.*?)\*\*', "bold"),      # 粗体
-            (r'\*(.*?)\*', "italic"),        # 斜体
-            (r'`(.*?)`', "code"),            # 内联代码
-        ]
-
-        # 找到所有匹配项并按位置排序
-        matches = []
-        for pattern, tag in patterns:
-            for match in re.finditer(pattern, text):
-                matches.append((match.start(), match.end(), match.group(1), tag))
-
-        matches.sort(key=lambda x: x[0])  # 按开始位置排序
-
-        # 处理重叠问题，优先处理较早出现的格式
-        filtered_matches = []
-        last_end = 0
-        for start, end, content, tag in matches:
-            if start >= last_end:
-                filtered_matches.append((start, end, content, tag))
-                last_end = end
-
-        # 构建格式化文本片段
-        current_pos = 0
-        for start, end, content, tag in filtered_matches:
-            # 添加前面的普通文本
-            if start > current_pos:
-                parts.append((text[current_pos:start], default_tag))
-            # 添加格式化文本
-            parts.append((content, tag))
-            current_pos = end
-
-        # 添加剩余的普通文本
-        if current_pos < len(text):
-            parts.append((text[current_pos:], default_tag))
-
-        # 如果没有找到任何格式，整个文本都使用默认格式
-        if not parts:
-            parts = [(text, default_tag)]
-
-        # 插入格式化文本
-        for part_text, tag in parts:
-            if part_text:  # 只插入非空文本
-                self.text_widget.insert(tk.END, part_text, tag)
-
 # 商业级深色主题配置
 class ModernTheme:
-    """商业级深色主题配置 - 专业科技感设计"""
+    """商业级深色主题配置 - 专业科技感设计
+
+    create_*_style() 的结果只依赖主题常量，首次调用后缓存，返回只读映射；需要修改时先复制。
+    """
 
     # === 高端大气上档次配色系统 ===
     # 深邃奢华背景系统 - 顶级质感
@@ -266,7 +583,6 @@ class ModernTheme:
     CARD_BACKGROUND_HOVER = "#1C2128"   # 卡片悬停 - 微妙变化
     CARD_BORDER = "#30363D"             # 精致分隔 - 高端设计
     CARD_BORDER_HOVER = "#58A6FF"       # 悬停强调 - 高端蓝
-    CARD_SHADOW = "rgba(0,0,0,0.4)"     # 深度阴影 - 奢华层次
 
     # 专业级主色调系统 - 参考Apple/Google设计系统
     PRIMARY = "#007AFF"                 # Apple蓝 - 专业权威
@@ -276,12 +592,6 @@ class ModernTheme:
     PRIMARY_DARK = "#003366"            # 深色变体 - 权威深蓝
     PRIMARY_GLOW = "#007AFF"            # 发光效果
 
-    # 专业级渐变系统 - 现代科技感
-    GRADIENT_START = "#007AFF"          # 渐变起始色 - Apple蓝
-    GRADIENT_END = "#0056CC"            # 渐变结束色 - 深蓝
-    GRADIENT_HOVER_START = "#0056CC"    # 悬停渐变起始 - 深蓝
-    GRADIENT_HOVER_END = "#004499"      # 悬停渐变结束 - 最深蓝
-
     # 专业级次要色调 - 参考Google Material Design
     SECONDARY = "#00C853"               # Material绿 - 专业活力
     SECONDARY_HOVER = "#00A843"         # 悬停态
@@ -338,21 +648,6 @@ class ModernTheme:
     SCROLLBAR_THUMB_HOVER = "#007AFF"   # 滚动条滑块悬停（Apple蓝）
     SCROLLBAR_WIDTH = 8                 # 滚动条宽度（更细）
 
-    # 阴影系统 - 多层次深度
-    SHADOW_XS = "#000000"               # 极小阴影
-    SHADOW_SM = "#000000"               # 小阴影
-    SHADOW_MD = "#000000"               # 中等阴影
-    SHADOW_LG = "#000000"               # 大阴影
-    SHADOW_XL = "#000000"               # 超大阴影
-    SHADOW_GLOW = "#4338ca"             # 发光阴影
-
-    # 渐变色系 - 现代科技感
-    GRADIENT_PRIMARY = "linear-gradient(135deg, #6366f1 0%, #8b5cf6 100%)"
-    GRADIENT_SECONDARY = "linear-gradient(135deg, #06b6d4 0%, #3b82f6 100%)"
-    GRADIENT_SUCCESS = "linear-gradient(135deg, #10b981 0%, #059669 100%)"
-    GRADIENT_DANGER = "linear-gradient(135deg, #ef4444 0%, #dc2626 100%)"
-    GRADIENT_CARD = "linear-gradient(145deg, #1c2128 0%, #161b22 100%)"
-
     # 字体系统 - 现代化层次
     FONT_FAMILY_PRIMARY = "Segoe UI"    # 主字体
     FONT_FAMILY_SECONDARY = "Microsoft YaHei UI"  # 中文字体
@@ -390,49 +685,54 @@ class ModernTheme:
     RADIUS_FULL = 9999                  # 完全圆角
 
     @staticmethod
+    @lru_cache(maxsize=None)
     def create_card_style():
         """创建现代化无边框卡片样式 - 扁平化设计"""
-        return {
+        return MappingProxyType({
             "bg": ModernTheme.CARD_BACKGROUND,
             "relief": tk.FLAT,
             "bd": 0,
             "highlightthickness": 0  # 完全无边框
-        }
+        })
 
     @staticmethod
+    @lru_cache(maxsize=None)
     def create_elevated_card_style():
         """创建现代化悬浮卡片样式 - 背景色差异层次"""
-        return {
+        return MappingProxyType({
             "bg": ModernTheme.BACKGROUND_ELEVATED,
             "relief": tk.FLAT,
             "bd": 0,
             "highlightthickness": 0  # 完全无边框，用背景色区分
-        }
+        })
 
     @staticmethod
+    @lru_cache(maxsize=None)
     def create_premium_card_style():
         """创建现代化高级卡片样式 - 无边框扁平设计"""
-        return {
+        return MappingProxyType({
             "bg": ModernTheme.CARD_BACKGROUND,
             "relief": tk.FLAT,  # 扁平化设计
             "bd": 0,  # 无边框
             "highlightthickness": 0  # 完全无边框
-        }
+        })
 
     @staticmethod
+    @lru_cache(maxsize=None)
     def create_modern_flat_card_style():
         """创建现代化扁平卡片样式 - Web应用风格"""
-        return {
+        return MappingProxyType({
             "bg": ModernTheme.BACKGROUND_SECONDARY,
             "relief": tk.FLAT,
             "bd": 0,
             "highlightthickness": 0  # 现代化无边框设计
-        }
+        })
 
     @staticmethod
+    @lru_cache(maxsize=None)
     def create_borderless_input_style():
         """创建完全无边框输入框样式 - 现代Web风格"""
-        return {
+        return MappingProxyType({
             "bg": ModernTheme.INPUT_BACKGROUND,
             "fg": ModernTheme.TEXT_PRIMARY,
             "relief": tk.FLAT,  # 完全扁平
@@ -443,12 +743,13 @@ class ModernTheme:
             "insertbackground": ModernTheme.PRIMARY,
             "selectbackground": ModernTheme.PRIMARY_LIGHT,
             "selectforeground": ModernTheme.TEXT_PRIMARY
-        }
+        })
 
     @staticmethod
+    @lru_cache(maxsize=None)
     def create_subtle_focus_input_style():
         """创建微妙聚焦效果输入框样式 - 现代化设计"""
-        return {
+        return MappingProxyType({
             "bg": ModernTheme.INPUT_BACKGROUND,
             "fg": ModernTheme.TEXT_PRIMARY,
             "relief": tk.FLAT,  # 扁平设计
@@ -459,12 +760,13 @@ class ModernTheme:
             "insertbackground": ModernTheme.PRIMARY,
             "selectbackground": ModernTheme.PRIMARY_LIGHT,
             "selectforeground": ModernTheme.TEXT_PRIMARY
-        }
+        })
 
     @staticmethod
+    @lru_cache(maxsize=None)
     def create_input_style():
         """创建现代化无边框输入框样式 - 扁平化设计"""
-        return {
+        return MappingProxyType({
             "bg": ModernTheme.INPUT_BACKGROUND,
             "fg": ModernTheme.TEXT_PRIMARY,
             "relief": tk.FLAT,  # 现代化扁平设计
@@ -475,12 +777,13 @@ class ModernTheme:
             "insertbackground": ModernTheme.PRIMARY,
             "selectbackground": ModernTheme.PRIMARY_LIGHT,
             "selectforeground": ModernTheme.TEXT_PRIMARY
-        }
+        })
 
     @staticmethod
+    @lru_cache(maxsize=None)
     def create_enhanced_input_style():
         """创建现代化无边框增强输入框样式 - Web应用风格"""
-        return {
+        return MappingProxyType({
             "bg": ModernTheme.INPUT_BACKGROUND,
             "fg": ModernTheme.TEXT_PRIMARY,
             "relief": tk.FLAT,  # 扁平化无边框设计
@@ -491,7 +794,7 @@ class ModernTheme:
             "insertbackground": ModernTheme.PRIMARY,
             "selectbackground": ModernTheme.PRIMARY_LIGHT,
             "selectforeground": ModernTheme.TEXT_PRIMARY
-        }
+        })
 
 class ModernScrolledText(tk.Frame):
     """现代化无边框滚动文本框组件"""
@@ -533,17 +836,9 @@ class ModernScrolledText(tk.Frame):
             width=0  # 设置宽度为0，完全隐藏
         )
 
-        # 配置文本框滚动
+        # 配置文本框滚动（鼠标滚轮使用Text类自带的绑定，不再逐个实例绑定Python回调）
         self.text.configure(yscrollcommand=self.scrollbar.set)
 
-        # 绑定鼠标滚轮事件
-        def _on_mousewheel(event):
-            self.text.yview_scroll(int(-1*(event.delta/120)), "units")
-
-        self.text.bind("<MouseWheel>", _on_mousewheel)
-        self.text.bind("<Button-4>", lambda e: self.text.yview_scroll(-1, "units"))
-        self.text.bind("<Button-5>", lambda e: self.text.yview_scroll(1, "units"))
-
         # 布局 - 不显示滚动条
         self.text.pack(side="left", fill="both", expand=True)
 
@@ -558,9 +853,30 @@ class ModernScrolledText(tk.Frame):
         self.tag_add = self.text.tag_add
         self.tag_remove = self.text.tag_remove
 
+@lru_cache(maxsize=64)
+def _lighten_color(color, percent):
+    """颜色变亮处理：向白色靠近percent%（整数运算，主题颜色有限，结果缓存）"""
+    value = color.lstrip('#')
+    if len(value) != 6:
+        return color
+    try:
+        rgb = int(value, 16)
+    except ValueError:
+        return color
+    r, g, b = rgb >> 16, (rgb >> 8) & 0xff, rgb & 0xff
+    r += (255 - r) * percent // 100
+    g += (255 - g) * percent // 100
+    b += (255 - b) * percent // 100
+    return f"#{(r << 16) | (g << 8) | b:06x}"
+
+
 class RoundedButton(tk.Canvas):
     """现代化圆角按钮组件 - 支持圆角和无边框设计"""
 
+    # 预渲染的按钮外观：Tk根窗口 -> {(宽, 高, 圆角, 颜色, 是否按下): PhotoImage}
+    # 悬停/按下/重绘时只贴一张图，不再逐个绘制矩形和椭圆；PhotoImage属于创建它的解释器，按根窗口分别缓存
+    _image_cache = weakref.WeakKeyDictionary()
+
     def __init__(self, parent, text="", command=None, style="primary", size="medium", icon="", radius=8, **kwargs):
         # 根据大小设置尺寸
         if size == "small":
@@ -578,6 +894,12 @@ class RoundedButton(tk.Canvas):
 
         super().__init__(parent, width=width, height=height, highlightthickness=0, **kwargs)
 
+        # 尺寸和父容器背景在此记录一次，重绘时不再向Tk查询；尺寸变化由<Configure>更新
+        self._width, self._height = width, height
+        # 设置画布背景为透明
+        parent_bg = parent.cget('bg') if hasattr(parent, 'cget') else ModernTheme.BACKGROUND_PRIMARY
+        self.configure(bg=parent_bg)
+
         self.text = text
         self.icon = icon
         self.command = command
@@ -586,6 +908,7 @@ class RoundedButton(tk.Canvas):
         self.font_size = font_size
         self.is_pressed = False
         self.is_hovered = False
+        self._redraw_id = None  # 已安排但尚未执行的重绘
 
         # 设置颜色
         self._setup_colors()
@@ -593,12 +916,12 @@ class RoundedButton(tk.Canvas):
         # 绘制按钮
         self._draw_button()
 
-        # 绑定事件
-        self.bind("<Button-1>", self._on_click)
+        # 绑定事件（<Button-1>与<ButtonPress-1>是同一事件，点击在释放时触发）
         self.bind("<Enter>", self._on_enter)
         self.bind("<Leave>", self._on_leave)
         self.bind("<ButtonPress-1>", self._on_press)
         self.bind("<ButtonRelease-1>", self._on_release)
+        self.bind("<Configure>", self._on_configure)
 
     def _setup_colors(self):
         """设置按钮颜色"""
@@ -645,28 +968,10 @@ class RoundedButton(tk.Canvas):
         else:
             current_color = self.bg_color
 
-        # 获取实际尺寸
-        width = self.winfo_width() if self.winfo_width() > 1 else self.winfo_reqwidth()
-        height = self.winfo_height() if self.winfo_height() > 1 else self.winfo_reqheight()
-
-        # 设置画布背景为透明
-        parent_bg = self.master.cget('bg') if hasattr(self.master, 'cget') else ModernTheme.BACKGROUND_PRIMARY
-        self.configure(bg=parent_bg)
+        width, height = self._width, self._height
 
         # 绘制高端圆角矩形（带阴影效果）
-        # 阴影层（使用深灰色模拟阴影）
-        shadow_offset = 1
-        shadow_color = "#1a1a1a"  # 深灰色阴影
-        self._draw_rounded_rect(shadow_offset, shadow_offset, width-2+shadow_offset, height-2+shadow_offset,
-                               self.radius, shadow_color)
-
-        # 主按钮层
-        self._draw_rounded_rect(1, 1, width-1, height-1, self.radius, current_color)
-
-        # 高光层（增加立体感）
-        if not self.is_pressed:
-            highlight_color = self._lighten_color(current_color, 0.15)
-            self._draw_rounded_rect(1, 1, width-1, height//2+2, self.radius, highlight_color, top_only=True)
+        self.create_image(0, 0, anchor="nw", image=self._button_image(width, height, current_color))
 
         # 绘制文本
         display_text = f"{self.icon} {self.text}" if self.icon else self.text
@@ -675,42 +980,48 @@ class RoundedButton(tk.Canvas):
                         text=display_text, fill=self.text_color,
                         font=(ModernTheme.FONT_FAMILY_PRIMARY, self.font_size, "bold"))
 
-    def _draw_rounded_rect(self, x1, y1, x2, y2, radius, fill_color, top_only=False):
-        """绘制高端圆角矩形"""
-        # 绘制主体矩形
+    def _button_image(self, width, height, color):
+        """获取按钮外观图片，首次使用时渲染并缓存"""
+        cache = RoundedButton._image_cache.setdefault(self._root(), {})
+        key = (width, height, self.radius, color, self.is_pressed)
+        photo = cache.get(key)
+        if photo is None:
+            # PIL只在用到图片时才导入，MCP服务启动时不加载
+            from PIL import Image, ImageDraw, ImageTk
+
+            image = Image.new("RGBA", (width, height), (0, 0, 0, 0))
+            draw = ImageDraw.Draw(image)
+
+            # 阴影层（使用深灰色模拟阴影）
+            shadow_offset = 1
+            shadow_color = "#1a1a1a"  # 深灰色阴影
+            self._draw_rounded_rect(draw, shadow_offset, shadow_offset, width-2+shadow_offset, height-2+shadow_offset,
+                                   self.radius, shadow_color)
+
+            # 主按钮层
+            self._draw_rounded_rect(draw, 1, 1, width-1, height-1, self.radius, color)
+
+            # 高光层（增加立体感）
+            if not self.is_pressed:
+                highlight_color = _lighten_color(color, 15)
+                self._draw_rounded_rect(draw, 1, 1, width-1, height//2+2, self.radius, highlight_color, top_only=True)
+
+            photo = cache[key] = ImageTk.PhotoImage(image)
+        return photo
+
+    @staticmethod
+    def _draw_rounded_rect(draw, x1, y1, x2, y2, radius, fill_color, top_only=False):
+        """绘制高端圆角矩形（坐标含义与Canvas一致，右/下边界不含在内）"""
+        if x2 <= x1 or y2 <= y1:
+            return
         if top_only:
-            # 只绘制上半部分
-            self.create_rectangle(x1 + radius, y1, x2 - radius, y1 + radius, fill=fill_color, outline="")
-            self.create_rectangle(x1, y1 + radius, x2, y1 + radius, fill=fill_color, outline="")
-            # 只绘制上面两个圆角
-            self.create_oval(x1, y1, x1 + 2*radius, y1 + 2*radius, fill=fill_color, outline="")
-            self.create_oval(x2 - 2*radius, y1, x2, y1 + 2*radius, fill=fill_color, outline="")
-        else:
-            # 绘制完整的圆角矩形
-            self.create_rectangle(x1 + radius, y1, x2 - radius, y2, fill=fill_color, outline="")
-            self.create_rectangle(x1, y1 + radius, x2, y2 - radius, fill=fill_color, outline="")
-
-            # 绘制四个圆角
-            self.create_oval(x1, y1, x1 + 2*radius, y1 + 2*radius, fill=fill_color, outline="")
-            self.create_oval(x2 - 2*radius, y1, x2, y1 + 2*radius, fill=fill_color, outline="")
-            self.create_oval(x1, y2 - 2*radius, x1 + 2*radius, y2, fill=fill_color, outline="")
-            self.create_oval(x2 - 2*radius, y2 - 2*radius, x2, y2, fill=fill_color, outline="")
-
-    def _lighten_color(self, color, factor):
-        """颜色变亮处理"""
-        try:
-            # 移除#号
-            color = color.lstrip('#')
-            # 转换为RGB
-            r, g, b = tuple(int(color[i:i+2], 16) for i in (0, 2, 4))
-            # 变亮
-            r = min(255, int(r + (255 - r) * factor))
-            g = min(255, int(g + (255 - g) * factor))
-            b = min(255, int(b + (255 - b) * factor))
-            # 转换回十六进制
-            return f"#{r:02x}{g:02x}{b:02x}"
-        except:
-            return color
+            # 高光只画顶部：高度为radius的一条，加上左右两个角上的圆（y2不参与）
+            if radius > 0 and x2 - x1 >= 2 * radius:
+                draw.rectangle((x1 + radius, y1, x2 - radius - 1, y1 + radius - 1), fill=fill_color)
+                draw.ellipse((x1, y1, x1 + 2*radius - 1, y1 + 2*radius - 1), fill=fill_color)
+                draw.ellipse((x2 - 2*radius, y1, x2 - 1, y1 + 2*radius - 1), fill=fill_color)
+            return
+        draw.rounded_rectangle((x1, y1, x2 - 1, y2 - 1), radius, fill=fill_color)
 
     def _on_click(self, event):
         """点击事件处理"""
@@ -718,104 +1029,138 @@ class RoundedButton(tk.Canvas):
             try:
                 self.command()
             except Exception as e:
-                print(f"按钮点击错误: {e}")
-                import traceback
+                # stdout是MCP的stdio通道，错误信息只能写到stderr
+                print(f"按钮点击错误: {e}", file=sys.stderr)
                 traceback.print_exc()
 
+    def _schedule_draw(self):
+        """安排在空闲时重绘，连续的悬停/按下事件合并为一次绘制"""
+        if self._redraw_id is None:
+            self._redraw_id = self.after_idle(self._do_draw)
+
+    def _do_draw(self):
+        """执行已安排的重绘"""
+        self._redraw_id = None
+        self._draw_button()
+
+    def destroy(self):
+        """销毁前取消尚未执行的重绘"""
+        if self._redraw_id is not None:
+            self.after_cancel(self._redraw_id)
+            self._redraw_id = None
+        super().destroy()
+
+    def _on_configure(self, event):
+        """尺寸变化时记录新尺寸并重绘"""
+        if (event.width, event.height) != (self._width, self._height):
+            self._width, self._height = event.width, event.height
+            self._schedule_draw()
+
     def _on_enter(self, event):
         """鼠标进入事件"""
         self.is_hovered = True
         self.configure(cursor="hand2")
-        self._draw_button()
+        self._schedule_draw()
 
     def _on_leave(self, event):
         """鼠标离开事件"""
         self.is_hovered = False
         self.configure(cursor="")
-        self._draw_button()
+        self._schedule_draw()
 
     def _on_press(self, event):
         """鼠标按下事件"""
         self.is_pressed = True
-        self._draw_button()
+        self._schedule_draw()
 
     def _on_release(self, event):
-        """鼠标释放事件"""
+        """鼠标释放事件：在按钮范围内释放才算一次点击"""
         self.is_pressed = False
-        self._draw_button()
+        self._schedule_draw()
+        if 0 <= event.x < self._width and 0 <= event.y < self._height:
+            self._on_click(event)
+
+@lru_cache(maxsize=32)
+def _button_style(style, size):
+    """ModernButton的配色和尺寸，按 (样式, 大小) 缓存"""
+    # 根据样式设置颜色 - 企业级专业配色
+    if style == "primary":
+        bg_color = ModernTheme.PRIMARY  # 企业蓝
+        hover_color = ModernTheme.PRIMARY_HOVER  # 悬停时更深
+        active_color = ModernTheme.PRIMARY_ACTIVE  # 按下时最深
+        text_color = "#ffffff"  # 白色文字确保对比度
+        border_color = ModernTheme.PRIMARY
+        glow_color = ModernTheme.PRIMARY_GLOW
+    elif style == "secondary":
+        bg_color = ModernTheme.SECONDARY  # 企业青绿
+        hover_color = ModernTheme.SECONDARY_HOVER  # 悬停时更深
+        active_color = ModernTheme.SECONDARY_ACTIVE  # 按下时最深
+        text_color = "#ffffff"  # 白色文字
+        border_color = ModernTheme.SECONDARY
+        glow_color = ModernTheme.SECONDARY_GLOW
+    elif style == "success":
+        bg_color = ModernTheme.SUCCESS  # 企业成功绿
+        hover_color = ModernTheme.SUCCESS_HOVER  # 悬停时更深
+        active_color = ModernTheme.SUCCESS_ACTIVE  # 按下时最深
+        text_color = "#ffffff"  # 白色文字
+        border_color = ModernTheme.SUCCESS
+        glow_color = ModernTheme.SUCCESS_GLOW
+    elif style == "danger":
+        bg_color = ModernTheme.DANGER  # 企业危险红
+        hover_color = ModernTheme.DANGER_HOVER  # 悬停时更深
+        active_color = ModernTheme.DANGER_ACTIVE  # 按下时最深
+        text_color = "#ffffff"  # 白色文字
+        border_color = ModernTheme.DANGER
+        glow_color = ModernTheme.DANGER_GLOW
+    elif style == "outline":
+        bg_color = ModernTheme.BACKGROUND_PRIMARY  # 使用主背景色
+        hover_color = ModernTheme.PRIMARY  # 悬停时填充企业蓝
+        active_color = ModernTheme.PRIMARY_ACTIVE  # 按下时更深
+        text_color = ModernTheme.PRIMARY  # 企业蓝文字
+        border_color = ModernTheme.PRIMARY  # 企业蓝边框
+        glow_color = ModernTheme.PRIMARY_GLOW
+    elif style == "ghost":
+        bg_color = ModernTheme.BACKGROUND_PRIMARY  # 使用主背景色
+        hover_color = ModernTheme.BACKGROUND_ELEVATED  # 悬停时微妙填充
+        active_color = ModernTheme.BACKGROUND_TERTIARY  # 按下时更深
+        text_color = ModernTheme.TEXT_SECONDARY  # 次要文字色
+        border_color = ModernTheme.BACKGROUND_PRIMARY  # 与背景同色
+        glow_color = ModernTheme.PRIMARY_GLOW
+    else:  # default
+        bg_color = ModernTheme.BACKGROUND_ELEVATED  # 企业级中性色
+        hover_color = ModernTheme.BACKGROUND_TERTIARY  # 悬停时更深
+        active_color = ModernTheme.CARD_BACKGROUND  # 按下时最深
+        text_color = ModernTheme.TEXT_PRIMARY  # 主要文字色
+        border_color = ModernTheme.CARD_BORDER
+        glow_color = ModernTheme.PRIMARY_GLOW
+
+    # 根据大小设置字体和间距 - 现代化尺寸系统
+    if size == "small":
+        font_size = ModernTheme.FONT_SIZE_SM
+        padx, pady = ModernTheme.SPACING_SM + 4, ModernTheme.SPACING_XS + 2
+        font_weight = ModernTheme.FONT_WEIGHT_MEDIUM
+    elif size == "large":
+        font_size = ModernTheme.FONT_SIZE_LG
+        padx, pady = ModernTheme.SPACING_LG, ModernTheme.SPACING_MD
+        font_weight = ModernTheme.FONT_WEIGHT_BOLD
+    elif size == "xl":
+        font_size = ModernTheme.FONT_SIZE_XL
+        padx, pady = ModernTheme.SPACING_XL, ModernTheme.SPACING_LG
+        font_weight = ModernTheme.FONT_WEIGHT_BOLD
+    else:  # medium
+        font_size = ModernTheme.FONT_SIZE_BASE
+        padx, pady = ModernTheme.SPACING_MD, ModernTheme.SPACING_SM
+        font_weight = ModernTheme.FONT_WEIGHT_MEDIUM
+
+    return (bg_color, hover_color, active_color, text_color, border_color, glow_color,
+            font_size, padx, pady, font_weight)
 
 class ModernButton(tk.Button):
     """商业级现代化按钮组件 - 深色主题专业设计（兼容性版本）"""
 
     def __init__(self, parent, text="", command=None, style="primary", size="medium", icon="", **kwargs):
-        # 根据样式设置颜色 - 企业级专业配色
-        if style == "primary":
-            bg_color = ModernTheme.PRIMARY  # 企业蓝
-            hover_color = ModernTheme.PRIMARY_HOVER  # 悬停时更深
-            active_color = ModernTheme.PRIMARY_ACTIVE  # 按下时最深
-            text_color = "#ffffff"  # 白色文字确保对比度
-            border_color = ModernTheme.PRIMARY
-            glow_color = ModernTheme.PRIMARY_GLOW
-        elif style == "secondary":
-            bg_color = ModernTheme.SECONDARY  # 企业青绿
-            hover_color = ModernTheme.SECONDARY_HOVER  # 悬停时更深
-            active_color = ModernTheme.SECONDARY_ACTIVE  # 按下时最深
-            text_color = "#ffffff"  # 白色文字
-            border_color = ModernTheme.SECONDARY
-            glow_color = ModernTheme.SECONDARY_GLOW
-        elif style == "success":
-            bg_color = ModernTheme.SUCCESS  # 企业成功绿
-            hover_color = ModernTheme.SUCCESS_HOVER  # 悬停时更深
-            active_color = ModernTheme.SUCCESS_ACTIVE  # 按下时最深
-            text_color = "#ffffff"  # 白色文字
-            border_color = ModernTheme.SUCCESS
-            glow_color = ModernTheme.SUCCESS_GLOW
-        elif style == "danger":
-            bg_color = ModernTheme.DANGER  # 企业危险红
-            hover_color = ModernTheme.DANGER_HOVER  # 悬停时更深
-            active_color = ModernTheme.DANGER_ACTIVE  # 按下时最深
-            text_color = "#ffffff"  # 白色文字
-            border_color = ModernTheme.DANGER
-            glow_color = ModernTheme.DANGER_GLOW
-        elif style == "outline":
-            bg_color = ModernTheme.BACKGROUND_PRIMARY  # 使用主背景色
-            hover_color = ModernTheme.PRIMARY  # 悬停时填充企业蓝
-            active_color = ModernTheme.PRIMARY_ACTIVE  # 按下时更深
-            text_color = ModernTheme.PRIMARY  # 企业蓝文字
-            border_color = ModernTheme.PRIMARY  # 企业蓝边框
-            glow_color = ModernTheme.PRIMARY_GLOW
-        elif style == "ghost":
-            bg_color = ModernTheme.BACKGROUND_PRIMARY  # 使用主背景色
-            hover_color = ModernTheme.BACKGROUND_ELEVATED  # 悬停时微妙填充
-            active_color = ModernTheme.BACKGROUND_TERTIARY  # 按下时更深
-            text_color = ModernTheme.TEXT_SECONDARY  # 次要文字色
-            border_color = ModernTheme.BACKGROUND_PRIMARY  # 与背景同色
-            glow_color = ModernTheme.PRIMARY_GLOW
-        else:  # default
-            bg_color = ModernTheme.BACKGROUND_ELEVATED  # 企业级中性色
-            hover_color = ModernTheme.BACKGROUND_TERTIARY  # 悬停时更深
-            active_color = ModernTheme.CARD_BACKGROUND  # 按下时最深
-            text_color = ModernTheme.TEXT_PRIMARY  # 主要文字色
-            border_color = ModernTheme.CARD_BORDER
-            glow_color = ModernTheme.PRIMARY_GLOW
-
-        # 根据大小设置字体和间距 - 现代化尺寸系统
-        if size == "small":
-            font_size = ModernTheme.FONT_SIZE_SM
-            padx, pady = ModernTheme.SPACING_SM + 4, ModernTheme.SPACING_XS + 2
-            font_weight = ModernTheme.FONT_WEIGHT_MEDIUM
-        elif size == "large":
-            font_size = ModernTheme.FONT_SIZE_LG
-            padx, pady = ModernTheme.SPACING_LG, ModernTheme.SPACING_MD
-            font_weight = ModernTheme.FONT_WEIGHT_BOLD
-        elif size == "xl":
-            font_size = ModernTheme.FONT_SIZE_XL
-            padx, pady = ModernTheme.SPACING_XL, ModernTheme.SPACING_LG
-            font_weight = ModernTheme.FONT_WEIGHT_BOLD
-        else:  # medium
-            font_size = ModernTheme.FONT_SIZE_BASE
-            padx, pady = ModernTheme.SPACING_MD, ModernTheme.SPACING_SM
-            font_weight = ModernTheme.FONT_WEIGHT_MEDIUM
+        (bg_color, hover_color, active_color, text_color, border_color, glow_color,
+         font_size, padx, pady, font_weight) = _button_style(style, size)
 
         # 处理图标和文本
         display_text = f"{icon} {text}" if icon else text
@@ -852,6 +1197,9 @@ class ModernButton(tk.Button):
         self.border_color = border_color
         self.glow_color = glow_color
         self.style_type = style
+        # 基础内边距，模拟缩放时在此基础上增减，不再每次cget读取
+        self._base_padx = default_style["padx"]
+        self._base_pady = default_style["pady"]
 
         # 动画状态
         self.is_pressed = False
@@ -865,27 +1213,37 @@ class ModernButton(tk.Button):
         self.bind("<FocusIn>", self._on_focus_in)
         self.bind("<FocusOut>", self._on_focus_out)
 
+    # 交互状态 -> (背景色属性名, padx增量, pady增量)；通过调整padding模拟缩放（tkinter限制）
+    _STATES = {
+        "normal": ("normal_bg", 0, 0),
+        "hover": ("hover_bg", 2, 1),
+        "pressed": ("active_bg", -2, -1),
+    }
+
+    def _set_state(self, state):
+        """切换交互状态 - 背景色和内边距在一次config中完成"""
+        bg_attr, dx, dy = self._STATES[state]
+        try:
+            self.config(bg=getattr(self, bg_attr),
+                        padx=max(0, self._base_padx + dx),
+                        pady=max(0, self._base_pady + dy))
+        except tk.TclError:
+            pass
+
     def _on_enter(self, event):
         """鼠标悬停效果 - 现代化无边框微交互"""
         if not self.is_pressed:
-            # 平滑颜色过渡动画
-            self._animate_color_transition(self.hover_bg, duration=150)
-            # 微妙的缩放效果（无边框）
-            self._animate_scale(1.02)
+            self._set_state("hover")
 
     def _on_leave(self, event):
         """鼠标离开效果 - 现代化平滑恢复"""
         if not self.is_pressed:
-            # 平滑恢复动画
-            self._animate_color_transition(self.normal_bg, duration=200)
-            self._animate_scale(1.0)
+            self._set_state("normal")
 
     def _on_press(self, event):
         """按下效果 - 现代化扁平按压反馈"""
         self.is_pressed = True
-        # 快速按压动画（无边框）
-        self._animate_color_transition(self.active_bg, duration=50)
-        self._animate_scale(0.98)
+        self._set_state("pressed")
 
     def _on_release(self, event):
         """释放效果 - 现代化无边框恢复"""
@@ -893,20 +1251,13 @@ class ModernButton(tk.Button):
         # 检查鼠标是否还在按钮上
         x, y = event.x, event.y
         if 0 <= x <= self.winfo_width() and 0 <= y <= self.winfo_height():
-            # 悬停状态（无边框）
-            self.config(bg=self.hover_bg, relief=tk.FLAT, bd=0, highlightthickness=0)
+            self._set_state("hover")
         else:
-            # 正常状态（无边框）
-            self.config(bg=self.normal_bg, relief=tk.FLAT, bd=0, highlightthickness=0)
+            self._set_state("normal")
 
     def _on_focus_in(self, event):
-        """获得焦点时的视觉反馈 - 现代化无边框发光效果"""
-        # 使用微妙的背景色变化替代边框
-        if self.style_type == "outline":
-            self.config(bg=self.hover_bg)
-        else:
-            # 为主要按钮添加微妙的亮度变化
-            self.config(bg=self.hover_bg)
+        """获得焦点时的视觉反馈 - 使用微妙的背景色变化替代边框"""
+        self.config(bg=self.hover_bg)
 
     def _on_focus_out(self, event):
         """失去焦点时恢复 - 无边框设计"""
@@ -920,185 +1271,243 @@ class ModernButton(tk.Button):
             # 恢复原始文本需要在外部处理
             self.config(state=tk.NORMAL)
 
-    def _animate_color_transition(self, target_color, duration=150):
-        """前端专家级颜色过渡动画"""
-        try:
-            self.config(bg=target_color)
-        except:
-            pass
-
-    def _animate_scale(self, scale_factor=1.02):
-        """现代化无边框缩放效果（模拟）"""
-        # tkinter限制，通过调整padding模拟缩放
-        try:
-            current_padx = self.cget("padx")
-            current_pady = self.cget("pady")
-            if scale_factor > 1:
-                self.config(padx=current_padx + 2, pady=current_pady + 1)
-            else:
-                self.config(padx=max(0, current_padx - 2), pady=max(0, current_pady - 1))
-        except:
-            pass
-
     def pulse_effect(self):
         """现代化无边框脉冲效果动画"""
-        def animate_pulse():
-            # 第一阶段：放大 + 变亮（无边框）
-            self._animate_scale(1.05)
-            self._animate_color_transition(self.hover_bg)
+        # 连续触发时只保留一个恢复定时器
+        if self.animation_id is not None:
+            self.after_cancel(self.animation_id)
+        # 第一阶段：放大 + 变亮；第二阶段：恢复
+        self._set_state("hover")
+        self.animation_id = self.after(200, self._end_pulse)
+
+    def _end_pulse(self):
+        """脉冲效果结束，恢复正常状态"""
+        self.animation_id = None
+        self._set_state("normal")
 
-            # 第二阶段：恢复（无边框）
-            self.animation_id = self.after(200, lambda: [
-                self._animate_scale(1.0),
-                self._animate_color_transition(self.normal_bg)
-            ])
+    def destroy(self):
+        """销毁前取消尚未执行的动画"""
+        if self.animation_id is not None:
+            self.after_cancel(self.animation_id)
+            self.animation_id = None
+        super().destroy()
 
-        animate_pulse()
+@lru_cache(maxsize=64)
+def _rounded_rect_points(x1, y1, x2, y2, radius):
+    """圆角矩形的多边形顶点，配合smooth=True使用
+
+    直边两端的顶点各重复一次，样条在直边上保持直线，只在四个角处弯曲成圆角。
+    """
+    radius = max(0, min(radius, (x2 - x1) // 2, (y2 - y1) // 2))
+    return (
+        x1 + radius, y1, x1 + radius, y1,
+        x2 - radius, y1, x2 - radius, y1,
+        x2, y1,
+        x2, y1 + radius, x2, y1 + radius,
+        x2, y2 - radius, x2, y2 - radius,
+        x2, y2,
+        x2 - radius, y2, x2 - radius, y2,
+        x1 + radius, y2, x1 + radius, y2,
+        x1, y2,
+        x1, y2 - radius, x1, y2 - radius,
+        x1, y1 + radius, x1, y1 + radius,
+        x1, y1,
+    )
 
 class RoundedFrame(tk.Frame):
     """高端圆角卡片组件 - 奢华质感设计"""
 
-    def __init__(self, parent, radius=12, shadow=True, **kwargs):
+    def __init__(self, parent, radius=12, shadow=False, **kwargs):
         # 提取背景色
         bg_color = kwargs.pop('bg', ModernTheme.CARD_BACKGROUND)
+        # 父容器背景只查询一次，框架和Canvas都使用它
+        parent_bg = parent.cget('bg') if hasattr(parent, 'cget') else ModernTheme.BACKGROUND_PRIMARY
 
-        super().__init__(parent, bg=parent.cget('bg') if hasattr(parent, 'cget') else ModernTheme.BACKGROUND_PRIMARY,
-                        relief=tk.FLAT, bd=0, highlightthickness=0)
+        super().__init__(parent, bg=parent_bg, relief=tk.FLAT, bd=0, highlightthickness=0)
 
         self.radius = radius
         self.bg_color = bg_color
         self.shadow = shadow
 
-        # 创建Canvas来绘制圆角
-        self.canvas = tk.Canvas(self, highlightthickness=0, **kwargs)
+        # 创建Canvas来绘制圆角（Canvas背景与父容器一致，圆角外看起来透明）
+        self.canvas = tk.Canvas(self, highlightthickness=0, bg=parent_bg, **kwargs)
         self.canvas.pack(fill=tk.BOTH, expand=True)
 
         # 内容框架
         self.content_frame = tk.Frame(self.canvas, bg=bg_color, relief=tk.FLAT, bd=0)
 
-        # 绑定事件
-        self.bind("<Configure>", self._on_configure)
-        self.canvas.bind("<Configure>", self._on_canvas_configure)
+        self._redraw_id = None  # 已安排但尚未执行的重绘
+        self._canvas_size = (0, 0)  # 最近一次<Configure>事件报告的Canvas尺寸
+        self._last_size = (0, 0)  # 上次绘制背景时的Canvas尺寸
+        self._bg_items = None  # 首次绘制时创建的Canvas项目：{"shadow", "background", "content_win": 项目id}
 
-    def _on_configure(self, event):
-        """窗口大小改变时重绘"""
-        self._draw_rounded_background()
+        # 绑定事件（Canvas填满整个框架，框架尺寸变化时Canvas也会收到<Configure>）
+        self.canvas.bind("<Configure>", self._on_canvas_configure)
 
     def _on_canvas_configure(self, event):
-        """Canvas大小改变时重绘"""
+        """Canvas大小改变时记录新尺寸并安排重绘"""
+        self._canvas_size = (event.width, event.height)
+        self._schedule_redraw()
+
+    def _schedule_redraw(self):
+        """安排重绘：拖动调整大小时每帧（约16ms）最多重绘一次，只按最终尺寸绘制"""
+        if self._redraw_id is None:
+            self._redraw_id = self.after(16, self._do_redraw)
+
+    def _do_redraw(self):
+        """执行已安排的重绘，尺寸未变化时跳过"""
+        self._redraw_id = None
         self._draw_rounded_background()
 
+    def destroy(self):
+        """销毁前取消尚未执行的重绘"""
+        if self._redraw_id is not None:
+            self.after_cancel(self._redraw_id)
+            self._redraw_id = None
+        super().destroy()
+
     def _draw_rounded_background(self):
         """绘制高端圆角背景"""
-        self.canvas.delete("background")
+        width, height = self._canvas_size
 
-        width = self.canvas.winfo_width()
-        height = self.canvas.winfo_height()
-
-        if width <= 1 or height <= 1:
+        if width <= 1 or height <= 1 or (width, height) == self._last_size:
+            return
+        self._last_size = (width, height)
+
+        shadow_offset = 2
+        shadow_points = _rounded_rect_points(shadow_offset, shadow_offset,
+                                             width - 2 + shadow_offset, height - 2 + shadow_offset,
+                                             self.radius)
+        background_points = _rounded_rect_points(2, 2, width - 2, height - 2, self.radius)
+        content_width = width - self.radius - 8
+        content_height = height - self.radius - 8
+
+        # 之后尺寸变化时只移动已有项目，不再删除重建
+        if self._bg_items is not None:
+            if self._bg_items["shadow"] is not None:
+                self.canvas.coords(self._bg_items["shadow"], shadow_points)
+            self.canvas.coords(self._bg_items["background"], background_points)
+            self.canvas.itemconfigure(self._bg_items["content_win"],
+                                      width=content_width, height=content_height)
             return
-
-        # 设置Canvas背景
-        parent_bg = self.master.cget('bg') if hasattr(self.master, 'cget') else ModernTheme.BACKGROUND_PRIMARY
-        self.canvas.configure(bg=parent_bg)
 
         # 绘制阴影（如果启用）
+        shadow_item = None
         if self.shadow:
-            shadow_offset = 2
             shadow_color = "#0f0f0f"  # 深色阴影
-            self._draw_rounded_rect_on_canvas(
-                shadow_offset, shadow_offset,
-                width - 2 + shadow_offset, height - 2 + shadow_offset,
-                self.radius, shadow_color, "shadow"
-            )
+            shadow_item = self._create_rounded_rect(shadow_points, shadow_color, "shadow")
 
         # 绘制主背景
-        self._draw_rounded_rect_on_canvas(
-            2, 2, width - 2, height - 2,
-            self.radius, self.bg_color, "background"
-        )
+        background_item = self._create_rounded_rect(background_points, self.bg_color, "background")
 
-        # 更新内容框架位置
-        self.canvas.create_window(
+        # 内容框架位置固定在左上角，只有宽高随尺寸变化
+        content_win = self.canvas.create_window(
             self.radius//2 + 4, self.radius//2 + 4,
             window=self.content_frame, anchor="nw",
-            width=width - self.radius - 8,
-            height=height - self.radius - 8
+            width=content_width,
+            height=content_height
         )
 
-    def _draw_rounded_rect_on_canvas(self, x1, y1, x2, y2, radius, fill_color, tag):
-        """在Canvas上绘制圆角矩形"""
-        # 绘制主体矩形
-        self.canvas.create_rectangle(x1 + radius, y1, x2 - radius, y2,
-                                   fill=fill_color, outline="", tags=tag)
-        self.canvas.create_rectangle(x1, y1 + radius, x2, y2 - radius,
-                                   fill=fill_color, outline="", tags=tag)
-
-        # 绘制四个圆角
-        self.canvas.create_oval(x1, y1, x1 + 2*radius, y1 + 2*radius,
-                              fill=fill_color, outline="", tags=tag)
-        self.canvas.create_oval(x2 - 2*radius, y1, x2, y1 + 2*radius,
-                              fill=fill_color, outline="", tags=tag)
-        self.canvas.create_oval(x1, y2 - 2*radius, x1 + 2*radius, y2,
-                              fill=fill_color, outline="", tags=tag)
-        self.canvas.create_oval(x2 - 2*radius, y2 - 2*radius, x2, y2,
-                              fill=fill_color, outline="", tags=tag)
+        self._bg_items = {"shadow": shadow_item, "background": background_item, "content_win": content_win}
+
+    def _create_rounded_rect(self, points, fill_color, tag):
+        """在Canvas上创建圆角矩形：一个平滑多边形，而不是两个矩形加四个椭圆"""
+        return self.canvas.create_polygon(points, smooth=True, fill=fill_color, outline="", tags=tag)
 
 class FeedbackDialog:
-    def __init__(self, work_summary: str = "", timeout_seconds: int = DIALOG_TIMEOUT):
-        self.result_queue = queue.Queue()
+    def __init__(self, work_summary: str = "", timeout_seconds: int = DIALOG_TIMEOUT, mode: str = "feedback"):
+        """
+        Args:
+            mode: "feedback" 为完整的汇报与反馈对话框；
+                  "single_image" 只显示图片选择区域，添加第一张图片后自动提交；
+                  "multi_image" 只显示图片选择区域，可添加多张，点击提交后返回
+        """
+        self._result = None  # 对话框关闭时交出结果的Future
+        self._timeout_id = None
         self.root = None
         self.work_summary = work_summary
         self.timeout_seconds = timeout_seconds
+        self.mode = mode
+        self.images_only = mode in ('single_image', 'multi_image')  # 只选择图片，不显示汇报和文字反馈
         self.selected_images = []  # 改为支持多张图片
+        self._image_keys = set()  # 已添加图片的去重键
         self.image_preview_frame = None
+        self._preview_widgets = []  # 与selected_images一一对应的预览卡片
+        self._card_pool = []  # 已移除、可复用的预览卡片
+        self._empty_state = None
         self.text_widget = None
+        self._placeholder_active = False  # 文字输入框中显示的是否仍是占位提示
+        # 图片文件的读取和缩略图生成放到后台线程，结果按选择顺序回到界面线程
+        self._io_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="feedback-image-io")
+        self._pending_loads = deque()
+        self._load_poll_id = None  # 轮询后台读取结果的after任务
+        self._submit_wait_id = None  # 等待后台读取完成后再提交的after任务
 
     def show_dialog(self):
-        """在新线程中显示反馈收集对话框"""
-        def run_dialog():
-            self.root = tk.Tk()
+        """显示反馈收集对话框，阻塞直到对话框关闭，返回结果（超时返回None）"""
+        return _run_dialog(self._open_window, self.timeout_seconds, lambda: self._close(None))
+
+    def _open_window(self, master, result):
+        """在Tk线程中创建对话框窗口"""
+        self._result = result
+        self.root = tk.Toplevel(master)
+        # 界面创建完成前先隐藏窗口，避免布局过程中闪烁
+        self.root.withdraw()
+        if self.images_only:
+            self.root.title("选择图片")
+            self.root.geometry("720x560")
+            self.root.minsize(600, 480)
+        else:
             self.root.title("🎯 AI工作汇报与反馈收集 - 专业版")
             self.root.geometry("1400x1100")  # 进一步增加高度确保底部可见
-            self.root.resizable(True, True)
-            self.root.configure(bg=ModernTheme.BACKGROUND_PRIMARY)
-
-            # 设置窗口图标和样式
-            try:
-                self.root.iconbitmap(default="")
-            except:
-                pass
-
             # 设置最小窗口大小（适应商业级布局）
             self.root.minsize(1200, 900)  # 进一步增加最小高度
+        self.root.resizable(True, True)
+        self.root.configure(bg=ModernTheme.BACKGROUND_PRIMARY)
 
-            # 居中显示窗口
-            self.root.eval('tk::PlaceWindow . center')
+        # 设置窗口图标和样式
+        try:
+            self.root.iconbitmap(default="")
+        except tk.TclError:
+            pass
 
-            # 设置窗口属性 - 现代化外观
-            try:
-                # Windows 10/11 深色标题栏
-                self.root.wm_attributes('-alpha', 0.98)  # 微妙的透明度
-            except:
-                pass
+        # 设置窗口属性 - 现代化外观
+        try:
+            # Windows 10/11 深色标题栏
+            self.root.wm_attributes('-alpha', 0.98)  # 微妙的透明度
+        except tk.TclError:
+            pass
 
+        try:
             # 创建界面
             self.create_widgets()
 
-            # 运行主循环
-            self.root.mainloop()
-
-        # 在新线程中运行对话框
-        dialog_thread = threading.Thread(target=run_dialog)
-        dialog_thread.daemon = True
-        dialog_thread.start()
-
-        # 等待结果
-        try:
-            result = self.result_queue.get(timeout=self.timeout_seconds)
-            return result
-        except queue.Empty:
-            return None
+            # 界面创建完成后只做一次布局计算，再居中显示窗口
+            # （Toplevel没有eval方法，通过解释器调用）
+            self.root.update_idletasks()
+            self.root.tk.call('tk::PlaceWindow', self.root, 'center')
+            self.root.deiconify()
+        except BaseException:
+            # 创建失败时销毁窗口，避免在常驻根窗口上遗留隐藏的Toplevel
+            self._io_pool.shutdown(wait=False)
+            self.root.destroy()
+            raise
+
+        # 点击窗口关闭按钮或超时都视为没有结果
+        self.root.protocol("WM_DELETE_WINDOW", lambda: self._close(None))
+        self._timeout_id = self.root.after(self.timeout_seconds * 1000, lambda: self._close(None))
+
+    def _close(self, result):
+        """关闭对话框窗口并交出结果（只生效一次）"""
+        if self._result.done():
+            return
+        self.root.after_cancel(self._timeout_id)
+        for after_id in (self._load_poll_id, self._submit_wait_id):
+            if after_id is not None:
+                self.root.after_cancel(after_id)
+        self._io_pool.shutdown(wait=False)
+        self.root.destroy()
+        self._result.set_result(result)
 
     def create_widgets(self):
         """创建商业级深色主题的现代化界面组件"""
@@ -1109,7 +1518,7 @@ class FeedbackDialog:
         # 主标题 - 调整字体大小
         title_label = tk.Label(
             header_frame,
-            text="🎯 AI工作汇报与反馈收集",
+            text="🖼️ 选择图片" if self.images_only else "🎯 AI工作汇报与反馈收集",
             font=(ModernTheme.FONT_FAMILY_PRIMARY, ModernTheme.FONT_SIZE_2XL, ModernTheme.FONT_WEIGHT_BOLD),
             bg=ModernTheme.BACKGROUND_PRIMARY,
             fg=ModernTheme.TEXT_PRIMARY
@@ -1119,7 +1528,7 @@ class FeedbackDialog:
         # 副标题 - 调整字体大小
         subtitle_label = tk.Label(
             header_frame,
-            text="专业级反馈收集系统 • 请查看AI完成的工作内容，并提供您的宝贵意见",
+            text=self.work_summary if self.images_only else "专业级反馈收集系统 • 请查看AI完成的工作内容，并提供您的宝贵意见",
             font=(ModernTheme.FONT_FAMILY_PRIMARY, ModernTheme.FONT_SIZE_SM),
             bg=ModernTheme.BACKGROUND_PRIMARY,
             fg=ModernTheme.TEXT_SECONDARY
@@ -1130,6 +1539,140 @@ class FeedbackDialog:
         separator = tk.Frame(self.root, height=1, bg=ModernTheme.BORDER_MUTED)
         separator.pack(fill=tk.X, padx=ModernTheme.SPACING_XL, pady=(ModernTheme.SPACING_LG, 0))
 
+        if self.images_only:
+            # 图片选择模式只需要图片卡片
+            image_feedback_card = self.create_image_card(self.root)
+            image_feedback_card.pack(fill=tk.BOTH, expand=True, padx=ModernTheme.SPACING_XL, pady=(ModernTheme.SPACING_LG, 0))
+        else:
+            self.create_feedback_panels()
+
+        self.create_bottom_bar()
+
+    def create_image_card(self, parent):
+        """创建图片反馈卡片（选择按钮和预览区域），由调用方负责布局"""
+        single_image = self.mode == 'single_image'
+        image_feedback_card = RoundedFrame(parent, radius=ModernTheme.RADIUS_LG,
+                                          bg=ModernTheme.CARD_BACKGROUND)
+
+        # 图片反馈标题区域 - 专业头部
+        image_feedback_header = tk.Frame(image_feedback_card.content_frame, bg=ModernTheme.CARD_BACKGROUND)
+        image_feedback_header.pack(fill=tk.X, padx=ModernTheme.SPACING_LG, pady=(ModernTheme.SPACING_LG, 0))
+        # 标题行和副标题直接用grid排在头部，不再嵌套标题容器
+        image_feedback_header.columnconfigure(1, weight=1)
+
+        # 图片图标
+        image_icon = tk.Label(
+            image_feedback_header,
+            text="🖼️",
+            font=(ModernTheme.FONT_FAMILY_PRIMARY, ModernTheme.FONT_SIZE_LG),
+            bg=ModernTheme.CARD_BACKGROUND,
+            fg=ModernTheme.TEXT_PRIMARY
+        )
+        image_icon.grid(row=0, column=0, padx=(0, ModernTheme.SPACING_SM))
+
+        # 主标题
+        tk.Label(
+            image_feedback_header,
+            text="图片反馈",
+            font=(ModernTheme.FONT_FAMILY_PRIMARY, ModernTheme.FONT_SIZE_LG, ModernTheme.FONT_WEIGHT_BOLD),
+            bg=ModernTheme.CARD_BACKGROUND,
+            fg=ModernTheme.TEXT_PRIMARY
+        ).grid(row=0, column=1, sticky="w")
+
+        # 多张支持标签
+        tk.Label(
+            image_feedback_header,
+            text="单张" if single_image else "支持多张",
+            font=(ModernTheme.FONT_FAMILY_PRIMARY, ModernTheme.FONT_SIZE_SM),
+            bg=ModernTheme.CARD_BACKGROUND,
+            fg=ModernTheme.TEXT_MUTED
+        ).grid(row=0, column=2, sticky="e")
+
+        # 副标题
+        tk.Label(
+            image_feedback_header,
+            text="选择图片后将自动提交" if single_image else "上传截图、照片或其他相关图片",
+            font=(ModernTheme.FONT_FAMILY_PRIMARY, ModernTheme.FONT_SIZE_SM),
+            bg=ModernTheme.CARD_BACKGROUND,
+            fg=ModernTheme.TEXT_SECONDARY
+        ).grid(row=1, column=0, columnspan=3, sticky="w", pady=(ModernTheme.SPACING_XS, 0))
+
+        # 图片操作按钮区域 - 现代化按钮组
+        btn_frame = tk.Frame(image_feedback_card.content_frame, bg=ModernTheme.CARD_BACKGROUND)
+        btn_frame.pack(fill=tk.X, padx=ModernTheme.SPACING_LG, pady=(ModernTheme.SPACING_MD, 0))
+
+        # 使用功能完整的现代化按钮（临时回退到ModernButton确保功能正常）
+        ModernButton(
+            btn_frame,
+            text="选择文件",
+            icon="📁",
+            command=self.select_image_file,
+            style="primary",
+            size="medium"
+        ).pack(side=tk.LEFT, padx=(0, ModernTheme.SPACING_SM))
+
+        ModernButton(
+            btn_frame,
+            text="剪贴板",
+            icon="📋",
+            command=self.paste_from_clipboard,
+            style="secondary",
+            size="medium"
+        ).pack(side=tk.LEFT, padx=(0, ModernTheme.SPACING_SM))
+
+        if not single_image:
+            ModernButton(
+                btn_frame,
+                text="清除",
+                icon="🗑️",
+                command=self.clear_all_images,
+                style="danger",
+                size="medium"
+            ).pack(side=tk.LEFT)
+
+        # 图片预览区域 - 现代化媒体展示
+        preview_container = tk.Frame(image_feedback_card.content_frame, bg=ModernTheme.CARD_BACKGROUND)
+        preview_container.pack(fill=tk.BOTH, expand=True, padx=ModernTheme.SPACING_LG, pady=(ModernTheme.SPACING_MD, ModernTheme.SPACING_LG))
+
+        # 创建现代化无边框滚动画布
+        canvas = tk.Canvas(
+            preview_container,
+            height=160,
+            bg=ModernTheme.INPUT_BACKGROUND,
+            relief=tk.FLAT,
+            bd=0,
+            highlightthickness=0,  # 完全移除边框
+            highlightbackground=ModernTheme.INPUT_BACKGROUND,
+            highlightcolor=ModernTheme.INPUT_BACKGROUND
+        )
+
+        # 完全隐藏滚动条 - 只保留滚动功能
+        self.image_preview_frame = tk.Frame(canvas, bg=ModernTheme.INPUT_BACKGROUND)
+
+        self.image_preview_frame.bind(
+            "<Configure>",
+            lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
+        )
+
+        canvas.create_window((0, 0), window=self.image_preview_frame, anchor="nw")
+
+        # 绑定鼠标滚轮事件实现滚动
+        def _on_mousewheel(event):
+            canvas.xview_scroll(int(-1*(event.delta/120)), "units")
+
+        canvas.bind("<MouseWheel>", _on_mousewheel)
+        canvas.bind("<Button-4>", lambda e: canvas.xview_scroll(-1, "units"))
+        canvas.bind("<Button-5>", lambda e: canvas.xview_scroll(1, "units"))
+
+        canvas.pack(side="top", fill="both", expand=True)
+
+        # 初始化图片预览
+        self.update_image_preview()
+
+        return image_feedback_card
+
+    def create_feedback_panels(self):
+        """创建AI工作汇报和用户反馈（文字+图片）的左右分栏"""
         # === 主内容区域 - 水平分割布局 ===
         content_frame = tk.Frame(self.root, bg=ModernTheme.BACKGROUND_PRIMARY)
         content_frame.pack(fill=tk.BOTH, expand=True, padx=ModernTheme.SPACING_XL, pady=(ModernTheme.SPACING_LG, 0))
@@ -1149,36 +1692,34 @@ class FeedbackDialog:
 
         # === 左侧区域：AI工作汇报 - 高端圆角卡片设计 ===
         # 工作汇报卡片 - 奢华圆角设计
-        report_card = RoundedFrame(left_frame, radius=ModernTheme.RADIUS_LG, shadow=True,
+        report_card = RoundedFrame(left_frame, radius=ModernTheme.RADIUS_LG,
                                   bg=ModernTheme.CARD_BACKGROUND)
         report_card.pack(fill=tk.BOTH, expand=True)
 
         # 卡片标题区域 - 专业头部设计
         report_header = tk.Frame(report_card.content_frame, bg=ModernTheme.CARD_BACKGROUND)
         report_header.pack(fill=tk.X, padx=ModernTheme.SPACING_LG, pady=(ModernTheme.SPACING_LG, 0))
-
-        # 标题图标和文字
-        title_container = tk.Frame(report_header, bg=ModernTheme.CARD_BACKGROUND)
-        title_container.pack(fill=tk.X)
+        # 标题图标和文字直接用grid排在头部
+        report_header.columnconfigure(1, weight=1)
 
         # 状态指示器 - 调整字体大小
         status_indicator = tk.Label(
-            title_container,
+            report_header,
             text="●",
             font=(ModernTheme.FONT_FAMILY_PRIMARY, ModernTheme.FONT_SIZE_BASE),
             bg=ModernTheme.CARD_BACKGROUND,
             fg=ModernTheme.SUCCESS
         )
-        status_indicator.pack(side=tk.LEFT, padx=(0, ModernTheme.SPACING_SM))
+        status_indicator.grid(row=0, column=0, padx=(0, ModernTheme.SPACING_SM))
 
         # 主标题 - 调整字体大小
         tk.Label(
-            title_container,
+            report_header,
             text="AI工作完成汇报",
             font=(ModernTheme.FONT_FAMILY_PRIMARY, ModernTheme.FONT_SIZE_BASE, ModernTheme.FONT_WEIGHT_BOLD),
             bg=ModernTheme.CARD_BACKGROUND,
             fg=ModernTheme.TEXT_PRIMARY
-        ).pack(side=tk.LEFT, anchor="w")
+        ).grid(row=0, column=1, sticky="w")
 
         # 副标题 - 调整字体大小
         tk.Label(
@@ -1187,7 +1728,7 @@ class FeedbackDialog:
             font=(ModernTheme.FONT_FAMILY_PRIMARY, ModernTheme.FONT_SIZE_XS),
             bg=ModernTheme.CARD_BACKGROUND,
             fg=ModernTheme.TEXT_SECONDARY
-        ).pack(anchor="w", pady=(ModernTheme.SPACING_XS, 0))
+        ).grid(row=1, column=0, columnspan=2, sticky="w", pady=(ModernTheme.SPACING_XS, 0))
 
         # 工作汇报内容区域 - 现代化无边框设计
         report_text = ModernScrolledText(
@@ -1221,45 +1762,43 @@ class FeedbackDialog:
 
         # === 右侧区域：用户反馈 - 专业双区域设计 ===
         # 右侧上半部分：文字反馈 - 高端圆角卡片
-        text_feedback_card = RoundedFrame(right_frame, radius=ModernTheme.RADIUS_LG, shadow=True,
+        text_feedback_card = RoundedFrame(right_frame, radius=ModernTheme.RADIUS_LG,
                                          bg=ModernTheme.CARD_BACKGROUND)
         text_feedback_card.pack(fill=tk.BOTH, expand=True, pady=(0, ModernTheme.SPACING_MD))
 
         # 文字反馈标题区域 - 专业头部
         text_feedback_header = tk.Frame(text_feedback_card.content_frame, bg=ModernTheme.CARD_BACKGROUND)
         text_feedback_header.pack(fill=tk.X, padx=ModernTheme.SPACING_LG, pady=(ModernTheme.SPACING_LG, 0))
-
-        # 标题容器
-        text_title_container = tk.Frame(text_feedback_header, bg=ModernTheme.CARD_BACKGROUND)
-        text_title_container.pack(fill=tk.X)
+        # 标题行和副标题直接用grid排在头部，不再嵌套标题容器
+        text_feedback_header.columnconfigure(1, weight=1)
 
         # 反馈图标
         feedback_icon = tk.Label(
-            text_title_container,
+            text_feedback_header,
             text="💭",
             font=(ModernTheme.FONT_FAMILY_PRIMARY, ModernTheme.FONT_SIZE_LG),
             bg=ModernTheme.CARD_BACKGROUND,
             fg=ModernTheme.TEXT_PRIMARY
         )
-        feedback_icon.pack(side=tk.LEFT, padx=(0, ModernTheme.SPACING_SM))
+        feedback_icon.grid(row=0, column=0, padx=(0, ModernTheme.SPACING_SM))
 
         # 主标题
         tk.Label(
-            text_title_container,
+            text_feedback_header,
             text="您的文字反馈",
             font=(ModernTheme.FONT_FAMILY_PRIMARY, ModernTheme.FONT_SIZE_LG, ModernTheme.FONT_WEIGHT_BOLD),
             bg=ModernTheme.CARD_BACKGROUND,
             fg=ModernTheme.TEXT_PRIMARY
-        ).pack(side=tk.LEFT, anchor="w")
+        ).grid(row=0, column=1, sticky="w")
 
         # 可选标签
         tk.Label(
-            text_title_container,
+            text_feedback_header,
             text="可选",
             font=(ModernTheme.FONT_FAMILY_PRIMARY, ModernTheme.FONT_SIZE_SM),
             bg=ModernTheme.CARD_BACKGROUND,
             fg=ModernTheme.TEXT_MUTED
-        ).pack(side=tk.RIGHT)
+        ).grid(row=0, column=2, sticky="e")
 
         # 副标题
         tk.Label(
@@ -1268,7 +1807,7 @@ class FeedbackDialog:
             font=(ModernTheme.FONT_FAMILY_PRIMARY, ModernTheme.FONT_SIZE_SM),
             bg=ModernTheme.CARD_BACKGROUND,
             fg=ModernTheme.TEXT_SECONDARY
-        ).pack(anchor="w", pady=(ModernTheme.SPACING_XS, 0))
+        ).grid(row=1, column=0, columnspan=3, sticky="w", pady=(ModernTheme.SPACING_XS, 0))
 
         # 前端专家级增强文本输入框
         self.text_widget = ModernScrolledText(
@@ -1280,129 +1819,17 @@ class FeedbackDialog:
             pady=ModernTheme.SPACING_MD
         )
         self.text_widget.pack(fill=tk.BOTH, expand=True, padx=ModernTheme.SPACING_LG, pady=(ModernTheme.SPACING_MD, ModernTheme.SPACING_LG))
-        self.text_widget.insert(tk.END, "💡 请在此输入您的反馈、建议或问题...\n\n✨ 您的意见对我们非常宝贵")
+        self.text_widget.insert(tk.END, FEEDBACK_PLACEHOLDER)
+        self._placeholder_active = True
         self.text_widget.bind("<FocusIn>", self.clear_placeholder)
 
         # 右侧下半部分：图片反馈 - 高端圆角媒体区域
-        image_feedback_card = RoundedFrame(right_frame, radius=ModernTheme.RADIUS_LG, shadow=True,
-                                          bg=ModernTheme.CARD_BACKGROUND)
+        image_feedback_card = self.create_image_card(right_frame)
         image_feedback_card.pack(fill=tk.BOTH, expand=True, pady=(ModernTheme.SPACING_MD, 0))
 
-        # 图片反馈标题区域 - 专业头部
-        image_feedback_header = tk.Frame(image_feedback_card.content_frame, bg=ModernTheme.CARD_BACKGROUND)
-        image_feedback_header.pack(fill=tk.X, padx=ModernTheme.SPACING_LG, pady=(ModernTheme.SPACING_LG, 0))
-
-        # 标题容器
-        image_title_container = tk.Frame(image_feedback_header, bg=ModernTheme.CARD_BACKGROUND)
-        image_title_container.pack(fill=tk.X)
-
-        # 图片图标
-        image_icon = tk.Label(
-            image_title_container,
-            text="🖼️",
-            font=(ModernTheme.FONT_FAMILY_PRIMARY, ModernTheme.FONT_SIZE_LG),
-            bg=ModernTheme.CARD_BACKGROUND,
-            fg=ModernTheme.TEXT_PRIMARY
-        )
-        image_icon.pack(side=tk.LEFT, padx=(0, ModernTheme.SPACING_SM))
-
-        # 主标题
-        tk.Label(
-            image_title_container,
-            text="图片反馈",
-            font=(ModernTheme.FONT_FAMILY_PRIMARY, ModernTheme.FONT_SIZE_LG, ModernTheme.FONT_WEIGHT_BOLD),
-            bg=ModernTheme.CARD_BACKGROUND,
-            fg=ModernTheme.TEXT_PRIMARY
-        ).pack(side=tk.LEFT, anchor="w")
-
-        # 多张支持标签
-        tk.Label(
-            image_title_container,
-            text="支持多张",
-            font=(ModernTheme.FONT_FAMILY_PRIMARY, ModernTheme.FONT_SIZE_SM),
-            bg=ModernTheme.CARD_BACKGROUND,
-            fg=ModernTheme.TEXT_MUTED
-        ).pack(side=tk.RIGHT)
-
-        # 副标题
-        tk.Label(
-            image_feedback_header,
-            text="上传截图、照片或其他相关图片",
-            font=(ModernTheme.FONT_FAMILY_PRIMARY, ModernTheme.FONT_SIZE_SM),
-            bg=ModernTheme.CARD_BACKGROUND,
-            fg=ModernTheme.TEXT_SECONDARY
-        ).pack(anchor="w", pady=(ModernTheme.SPACING_XS, 0))
-
-        # 图片操作按钮区域 - 现代化按钮组
-        btn_frame = tk.Frame(image_feedback_card.content_frame, bg=ModernTheme.CARD_BACKGROUND)
-        btn_frame.pack(fill=tk.X, padx=ModernTheme.SPACING_LG, pady=(ModernTheme.SPACING_MD, 0))
-
-        # 使用功能完整的现代化按钮（临时回退到ModernButton确保功能正常）
-        ModernButton(
-            btn_frame,
-            text="选择文件",
-            icon="📁",
-            command=self.select_image_file,
-            style="primary",
-            size="medium"
-        ).pack(side=tk.LEFT, padx=(0, ModernTheme.SPACING_SM))
-
-        ModernButton(
-            btn_frame,
-            text="剪贴板",
-            icon="📋",
-            command=self.paste_from_clipboard,
-            style="secondary",
-            size="medium"
-        ).pack(side=tk.LEFT, padx=(0, ModernTheme.SPACING_SM))
-
-        ModernButton(
-            btn_frame,
-            text="清除",
-            icon="🗑️",
-            command=self.clear_all_images,
-            style="danger",
-            size="medium"
-        ).pack(side=tk.LEFT)
-
-        # 图片预览区域 - 现代化媒体展示
-        preview_container = tk.Frame(image_feedback_card.content_frame, bg=ModernTheme.CARD_BACKGROUND)
-        preview_container.pack(fill=tk.BOTH, expand=True, padx=ModernTheme.SPACING_LG, pady=(ModernTheme.SPACING_MD, ModernTheme.SPACING_LG))
-
-        # 创建现代化无边框滚动画布
-        canvas = tk.Canvas(
-            preview_container,
-            height=160,
-            bg=ModernTheme.INPUT_BACKGROUND,
-            relief=tk.FLAT,
-            bd=0,
-            highlightthickness=0,  # 完全移除边框
-            highlightbackground=ModernTheme.INPUT_BACKGROUND,
-            highlightcolor=ModernTheme.INPUT_BACKGROUND
-        )
-
-        # 完全隐藏滚动条 - 只保留滚动功能
-        self.image_preview_frame = tk.Frame(canvas, bg=ModernTheme.INPUT_BACKGROUND)
-
-        self.image_preview_frame.bind(
-            "<Configure>",
-            lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
-        )
-
-        canvas.create_window((0, 0), window=self.image_preview_frame, anchor="nw")
-
-        # 绑定鼠标滚轮事件实现滚动
-        def _on_mousewheel(event):
-            canvas.xview_scroll(int(-1*(event.delta/120)), "units")
-
-        canvas.bind("<MouseWheel>", _on_mousewheel)
-        canvas.bind("<Button-4>", lambda e: canvas.xview_scroll(-1, "units"))
-        canvas.bind("<Button-5>", lambda e: canvas.xview_scroll(1, "units"))
-
-        canvas.pack(side="top", fill="both", expand=True)
-
-        # 初始化图片预览
-        self.update_image_preview()
+    def create_bottom_bar(self):
+        """创建底部操作栏"""
+        single_image = self.mode == 'single_image'
 
         # === 底部操作区域 - 专业级操作栏 ===
         # 分隔线
@@ -1414,31 +1841,36 @@ class FeedbackDialog:
         bottom_frame.pack(fill=tk.X, padx=ModernTheme.SPACING_XL, pady=(ModernTheme.SPACING_LG, ModernTheme.SPACING_XL))
 
         # 左侧说明文字
-        info_container = tk.Frame(bottom_frame, bg=ModernTheme.BACKGROUND_PRIMARY)
-        info_container.pack(side=tk.LEFT, fill=tk.X, expand=True)
-
+        if single_image:
+            info_text = "💡 选择文件或从剪贴板粘贴一张图片"
+        elif self.images_only:
+            info_text = "💡 选择文件或从剪贴板粘贴图片，可添加多张，完成后点击提交"
+        else:
+            info_text = "💡 您可以只提供文字反馈、只提供图片，或者两者都提供"
         info_label = tk.Label(
-            info_container,
-            text="💡 您可以只提供文字反馈、只提供图片，或者两者都提供",
+            bottom_frame,
+            text=info_text,
             font=(ModernTheme.FONT_FAMILY_PRIMARY, ModernTheme.FONT_SIZE_SM),
             fg=ModernTheme.TEXT_MUTED,
-            bg=ModernTheme.BACKGROUND_PRIMARY
+            bg=ModernTheme.BACKGROUND_PRIMARY,
+            anchor="w"
         )
-        info_label.pack(anchor="w")
+        info_label.pack(side=tk.LEFT, fill=tk.X, expand=True)
 
         # 右侧按钮容器
         button_container = tk.Frame(bottom_frame, bg=ModernTheme.BACKGROUND_PRIMARY)
         button_container.pack(side=tk.RIGHT)
 
-        # 主要操作按钮 - 功能完整的现代化设计
-        ModernButton(
-            button_container,
-            text="提交反馈",
-            icon="✅",
-            command=self.submit_feedback,
-            style="success",
-            size="large"
-        ).pack(side=tk.LEFT, padx=(0, ModernTheme.SPACING_MD))
+        # 主要操作按钮 - 功能完整的现代化设计（单图模式添加图片后自动提交）
+        if not single_image:
+            ModernButton(
+                button_container,
+                text="提交反馈",
+                icon="✅",
+                command=self.submit_feedback,
+                style="success",
+                size="large"
+            ).pack(side=tk.LEFT, padx=(0, ModernTheme.SPACING_MD))
 
         ModernButton(
             button_container,
@@ -1450,9 +1882,9 @@ class FeedbackDialog:
         ).pack(side=tk.LEFT)
 
     def clear_placeholder(self, event):
-        """清除占位符文本"""
-        current_text = self.text_widget.get(1.0, tk.END).strip()
-        if current_text in ["请在此输入您的反馈、建议或问题...", "💡 请在此输入您的反馈、建议或问题...\n\n✨ 您的意见对我们非常宝贵"]:
+        """清除占位符文本（只在首次获得焦点时清除，不再读取整个输入内容比较）"""
+        if self._placeholder_active:
+            self._placeholder_active = False
             self.text_widget.delete(1.0, tk.END)
 
     def select_image_file(self):
@@ -1464,218 +1896,335 @@ class FeedbackDialog:
             ("所有文件", "*.*")
         ]
 
-        file_paths = filedialog.askopenfilenames(
-            title="选择图片文件（可多选）",
-            filetypes=file_types
-        )
+        if self.mode == 'single_image':
+            file_path = filedialog.askopenfilename(
+                title="选择图片文件",
+                filetypes=file_types,
+                parent=self.root
+            )
+            file_paths = (file_path,) if file_path else ()
+        else:
+            file_paths = filedialog.askopenfilenames(
+                title="选择图片文件（可多选）",
+                filetypes=file_types,
+                parent=self.root
+            )
 
         for file_path in file_paths:
+            future = self._io_pool.submit(_load_image_file, file_path)
+            self._pending_loads.append((file_path, future))
+        self._schedule_load_poll()
+
+    def _schedule_load_poll(self):
+        """还有图片在后台读取时，安排界面线程稍后检查结果（后台线程从不直接调用Tk）"""
+        if self._load_poll_id is None and self._pending_loads:
+            self._load_poll_id = self.root.after(LOAD_POLL_MS, self._poll_loaded_images)
+
+    def _poll_loaded_images(self):
+        """处理已完成的读取结果，队列清空前继续轮询"""
+        self._load_poll_id = None
+        self._drain_loaded_images()
+        if not self._result.done():
+            self._schedule_load_poll()
+
+    def _drain_loaded_images(self):
+        """按选择顺序把已经读取完成的图片加入预览"""
+        # 错误提示框打开期间对话框可能已经关闭，单张图片模式下加入图片也会自动提交并关闭对话框，
+        # 每次都重新检查
+        while not self._result.done() and self._pending_loads and self._pending_loads[0][1].done():
+            file_path, future = self._pending_loads.popleft()
             try:
-                # 读取并验证图片
-                with open(file_path, 'rb') as f:
-                    image_data = f.read()
-
-                img = Image.open(io.BytesIO(image_data))
-                self.selected_images.append({
-                    'data': image_data,
-                    'source': f'文件: {Path(file_path).name}',
-                    'size': img.size,
-                    'image': img
-                })
-
+                img_info = future.result()
             except Exception as e:
-                messagebox.showerror("错误", f"无法读取图片文件 {Path(file_path).name}: {str(e)}")
-
-        self.update_image_preview()
+                messagebox.showerror("错误", f"无法读取图片文件 {Path(file_path).name}: {str(e)}", parent=self.root)
+                continue
+            self._add_image(img_info)
 
     def paste_from_clipboard(self):
         """从剪贴板粘贴图片"""
         try:
-            from PIL import ImageGrab
-            img = ImageGrab.grabclipboard()
+            from PIL import Image, ImageGrab
 
-            if img:
-                buffer = io.BytesIO()
-                img.save(buffer, format='PNG')
-                image_data = buffer.getvalue()
+            img = ImageGrab.grabclipboard()
 
-                self.selected_images.append({
-                    'data': image_data,
+            # 复制文件时部分平台返回文件名列表而不是图片
+            if isinstance(img, Image.Image):
+                # 只保留PIL图片，PNG编码推迟到提交时；按完整像素数据去重
+                # （不能只取开头几KB：截图的前几行往往都是相同的标题栏）
+                self._add_image({
+                    'key': (img.mode, img.size, hashlib.blake2b(img.tobytes(), digest_size=16).digest()),
                     'source': '剪贴板',
+                    'display_source': '剪贴板',
                     'size': img.size,
                     'image': img
                 })
-
-                self.update_image_preview()
             else:
-                messagebox.showwarning("警告", "剪贴板中没有图片数据")
+                messagebox.showwarning("警告", "剪贴板中没有图片数据", parent=self.root)
 
-        except Exception as e:
-            messagebox.showerror("错误", f"无法从剪贴板获取图片: {str(e)}")
+        except (NotImplementedError, OSError) as e:
+            messagebox.showerror("错误", f"无法从剪贴板获取图片: {str(e)}", parent=self.root)
 
     def clear_all_images(self):
         """清除所有选择的图片"""
         self.selected_images = []
+        self._image_keys.clear()
         self.update_image_preview()
 
+    def _add_image(self, img_info):
+        """添加一张图片，只为它追加预览卡片；重复的图片直接忽略"""
+        if img_info['key'] in self._image_keys:
+            return
+        self._image_keys.add(img_info['key'])
+        self.selected_images.append(img_info)
+        if self.mode == 'single_image':
+            self.submit_feedback()
+            return
+        self._append_preview(img_info)
+
     def update_image_preview(self):
-        """更新图片预览显示 - 现代化深色主题"""
-        # 清除现有预览
-        for widget in self.image_preview_frame.winfo_children():
-            widget.destroy()
+        """重建整个图片预览区域 - 现代化深色主题"""
+        # 现有预览卡片全部回收（空状态提示常驻，只切换显示）
+        for card in self._preview_widgets:
+            self._recycle_card(card)
+        self._preview_widgets = []
 
         if not self.selected_images:
-            # 显示现代化空状态提示
-            empty_container = tk.Frame(self.image_preview_frame, bg=ModernTheme.INPUT_BACKGROUND)
-            empty_container.pack(expand=True, fill=tk.BOTH)
-
-            # 空状态图标
-            empty_icon = tk.Label(
-                empty_container,
-                text="🖼️",
-                bg=ModernTheme.INPUT_BACKGROUND,
-                fg=ModernTheme.TEXT_MUTED,
-                font=(ModernTheme.FONT_FAMILY_PRIMARY, ModernTheme.FONT_SIZE_3XL)
-            )
-            empty_icon.pack(pady=(ModernTheme.SPACING_XL, ModernTheme.SPACING_SM))
-
-            # 空状态文字
-            no_image_label = tk.Label(
-                empty_container,
-                text="暂无图片",
-                bg=ModernTheme.INPUT_BACKGROUND,
-                fg=ModernTheme.TEXT_SECONDARY,
-                font=(ModernTheme.FONT_FAMILY_PRIMARY, ModernTheme.FONT_SIZE_LG, ModernTheme.FONT_WEIGHT_MEDIUM)
-            )
-            no_image_label.pack()
-
-            # 提示文字
-            hint_label = tk.Label(
-                empty_container,
-                text="点击上方按钮添加图片",
-                bg=ModernTheme.INPUT_BACKGROUND,
-                fg=ModernTheme.TEXT_MUTED,
-                font=(ModernTheme.FONT_FAMILY_PRIMARY, ModernTheme.FONT_SIZE_SM)
-            )
-            hint_label.pack(pady=(ModernTheme.SPACING_XS, ModernTheme.SPACING_XL))
+            self._show_empty_state()
         else:
-            # 显示所有图片预览 - 现代化卡片设计
-            for i, img_info in enumerate(self.selected_images):
-                try:
-                    # 创建现代化图片预览卡片
-                    img_container = tk.Frame(
-                        self.image_preview_frame,
-                        bg=ModernTheme.CARD_BACKGROUND,
-                        relief=tk.FLAT,
-                        bd=0,
-                        highlightthickness=1,
-                        highlightbackground=ModernTheme.CARD_BORDER
-                    )
-                    img_container.pack(side=tk.LEFT, padx=ModernTheme.SPACING_SM, pady=ModernTheme.SPACING_SM)
-
-                    # 创建更大的缩略图
-                    img_copy = img_info['image'].copy()
-                    img_copy.thumbnail((140, 105), Image.Resampling.LANCZOS)
-
-                    # 转换为tkinter可用的格式
-                    photo = ImageTk.PhotoImage(img_copy)
-
-                    # 图片标签 - 现代化样式
-                    img_label = tk.Label(
-                        img_container,
-                        image=photo,
-                        bg=ModernTheme.CARD_BACKGROUND,
-                        relief=tk.FLAT,
-                        bd=0
-                    )
-                    img_label.image = photo  # 保持引用
-                    img_label.pack(padx=ModernTheme.SPACING_SM, pady=(ModernTheme.SPACING_SM, ModernTheme.SPACING_XS))
-
-                    # 图片信息 - 现代化排版
-                    info_frame = tk.Frame(img_container, bg=ModernTheme.CARD_BACKGROUND)
-                    info_frame.pack(fill=tk.X, padx=ModernTheme.SPACING_SM)
-
-                    # 文件来源
-                    source_label = tk.Label(
-                        info_frame,
-                        text=img_info['source'],
-                        font=(ModernTheme.FONT_FAMILY_PRIMARY, ModernTheme.FONT_SIZE_XS, ModernTheme.FONT_WEIGHT_MEDIUM),
-                        bg=ModernTheme.CARD_BACKGROUND,
-                        fg=ModernTheme.TEXT_PRIMARY,
-                        justify=tk.CENTER
-                    )
-                    source_label.pack()
-
-                    # 尺寸信息
-                    size_label = tk.Label(
-                        info_frame,
-                        text=f"{img_info['size'][0]} × {img_info['size'][1]}",
-                        font=(ModernTheme.FONT_FAMILY_PRIMARY, ModernTheme.FONT_SIZE_XS),
-                        bg=ModernTheme.CARD_BACKGROUND,
-                        fg=ModernTheme.TEXT_MUTED,
-                        justify=tk.CENTER
-                    )
-                    size_label.pack(pady=(0, ModernTheme.SPACING_XS))
-
-                    # 删除按钮 - 现代化圆角设计
-                    del_btn = RoundedButton(
-                        img_container,
-                        text="移除",
-                        icon="🗑️",
-                        command=lambda idx=i: self.remove_image(idx),
-                        style="danger",
-                        size="small",
-                        radius=ModernTheme.RADIUS_SM,
-                        bg=ModernTheme.CARD_BACKGROUND
-                    )
-                    del_btn.pack(pady=(0, ModernTheme.SPACING_SM))
-
-                except Exception as e:
-                    print(f"预览更新失败: {e}")
+            for img_info in self.selected_images:
+                self._append_preview(img_info)
+
+    def _show_empty_state(self):
+        """显示现代化空状态提示"""
+        if self._empty_state is None:
+            self._empty_state = self._create_empty_state()
+        self._empty_state.pack(expand=True, fill=tk.BOTH)
+
+    def _create_empty_state(self):
+        """创建空状态提示，只创建一次，之后通过pack/pack_forget切换显示"""
+        empty_container = tk.Frame(self.image_preview_frame, bg=ModernTheme.INPUT_BACKGROUND)
+
+        # 空状态图标
+        empty_icon = tk.Label(
+            empty_container,
+            text="🖼️",
+            bg=ModernTheme.INPUT_BACKGROUND,
+            fg=ModernTheme.TEXT_MUTED,
+            font=(ModernTheme.FONT_FAMILY_PRIMARY, ModernTheme.FONT_SIZE_3XL)
+        )
+        empty_icon.pack(pady=(ModernTheme.SPACING_XL, ModernTheme.SPACING_SM))
+
+        # 空状态文字
+        no_image_label = tk.Label(
+            empty_container,
+            text="暂无图片",
+            bg=ModernTheme.INPUT_BACKGROUND,
+            fg=ModernTheme.TEXT_SECONDARY,
+            font=(ModernTheme.FONT_FAMILY_PRIMARY, ModernTheme.FONT_SIZE_LG, ModernTheme.FONT_WEIGHT_MEDIUM)
+        )
+        no_image_label.pack()
+
+        # 提示文字
+        hint_label = tk.Label(
+            empty_container,
+            text="点击上方按钮添加图片",
+            bg=ModernTheme.INPUT_BACKGROUND,
+            fg=ModernTheme.TEXT_MUTED,
+            font=(ModernTheme.FONT_FAMILY_PRIMARY, ModernTheme.FONT_SIZE_SM)
+        )
+        hint_label.pack(pady=(ModernTheme.SPACING_XS, ModernTheme.SPACING_XL))
+
+        return empty_container
+
+    def _append_preview(self, img_info):
+        """在预览区域末尾追加一张图片卡片 - 优先复用已回收的卡片"""
+        if self._empty_state is not None:
+            self._empty_state.pack_forget()
+
+        card = self._card_pool.pop() if self._card_pool else self._create_preview_card()
+        card['container'].pack(side=tk.LEFT, padx=ModernTheme.SPACING_SM, pady=ModernTheme.SPACING_SM)
+        self._preview_widgets.append(card)
+
+        try:
+            # 缩略图PhotoImage只创建一次，缓存在图片条目上
+            photo = img_info.get('photo')
+            if photo is None:
+                thumbnail = img_info.pop('thumbnail', None)
+                if thumbnail is None:
+                    thumbnail = _create_thumbnail(img_info)
+                from PIL import ImageTk
+                photo = img_info['photo'] = ImageTk.PhotoImage(thumbnail)
+        except Exception as e:
+            print(f"预览更新失败: {e}", file=sys.stderr)
+            photo = ''
+
+        card['image'].config(image=photo)
+        card['image'].image = photo  # 保持引用
+        card['source'].config(text=img_info['display_source'])
+        card['size'].config(text=f"{img_info['size'][0]} × {img_info['size'][1]}")
+        # 按条目查找当前索引，前面的图片被删除后依然正确
+        card['remove'].command = lambda: self._remove_image_entry(img_info)
+
+    def _create_preview_card(self):
+        """创建一张空的现代化图片预览卡片，内容由_append_preview填充"""
+        img_container = tk.Frame(
+            self.image_preview_frame,
+            bg=ModernTheme.CARD_BACKGROUND,
+            relief=tk.FLAT,
+            bd=0,
+            highlightthickness=1,
+            highlightbackground=ModernTheme.CARD_BORDER
+        )
+
+        # 图片标签 - 现代化样式
+        img_label = tk.Label(
+            img_container,
+            bg=ModernTheme.CARD_BACKGROUND,
+            relief=tk.FLAT,
+            bd=0
+        )
+        img_label.pack(padx=ModernTheme.SPACING_SM, pady=(ModernTheme.SPACING_SM, ModernTheme.SPACING_XS))
+
+        # 图片信息 - 现代化排版
+        info_frame = tk.Frame(img_container, bg=ModernTheme.CARD_BACKGROUND)
+        info_frame.pack(fill=tk.X, padx=ModernTheme.SPACING_SM)
+
+        # 文件来源
+        source_label = tk.Label(
+            info_frame,
+            font=(ModernTheme.FONT_FAMILY_PRIMARY, ModernTheme.FONT_SIZE_XS, ModernTheme.FONT_WEIGHT_MEDIUM),
+            bg=ModernTheme.CARD_BACKGROUND,
+            fg=ModernTheme.TEXT_PRIMARY,
+            justify=tk.CENTER
+        )
+        source_label.pack()
+
+        # 尺寸信息
+        size_label = tk.Label(
+            info_frame,
+            font=(ModernTheme.FONT_FAMILY_PRIMARY, ModernTheme.FONT_SIZE_XS),
+            bg=ModernTheme.CARD_BACKGROUND,
+            fg=ModernTheme.TEXT_MUTED,
+            justify=tk.CENTER
+        )
+        size_label.pack(pady=(0, ModernTheme.SPACING_XS))
+
+        # 删除按钮 - 现代化圆角设计
+        del_btn = RoundedButton(
+            img_container,
+            text="移除",
+            icon="🗑️",
+            style="danger",
+            size="small",
+            radius=ModernTheme.RADIUS_SM,
+            bg=ModernTheme.CARD_BACKGROUND
+        )
+        del_btn.pack(pady=(0, ModernTheme.SPACING_SM))
+
+        return {'container': img_container, 'image': img_label, 'source': source_label,
+                'size': size_label, 'remove': del_btn}
+
+    def _recycle_card(self, card):
+        """隐藏预览卡片并放回复用池，释放对缩略图的引用"""
+        card['container'].pack_forget()
+        card['image'].config(image='')
+        card['image'].image = None
+        card['remove'].command = None
+        self._card_pool.append(card)
+
+    def _remove_image_entry(self, img_info):
+        """删除指定的图片条目"""
+        for index, info in enumerate(self.selected_images):
+            if info is img_info:
+                self.remove_image(index)
+                return
 
     def remove_image(self, index):
-        """删除指定索引的图片"""
+        """删除指定索引的图片，只销毁对应的预览卡片"""
         if 0 <= index < len(self.selected_images):
-            self.selected_images.pop(index)
-            self.update_image_preview()
+            self._image_keys.discard(self.selected_images.pop(index)['key'])
+            self._recycle_card(self._preview_widgets.pop(index))
+            if not self.selected_images:
+                self._show_empty_state()
 
     def submit_feedback(self):
         """提交反馈"""
+        if self._submit_wait_id is not None:
+            # 已经在等待图片读取或编码完成
+            return
+        if self._pending_loads:
+            # 还有图片在后台读取，等它们加入列表后再提交，避免丢失
+            self._submit_wait_id = self.root.after(LOAD_POLL_MS, self._submit_after_loads)
+            return
+
         # 获取文本内容
-        text_content = self.text_widget.get(1.0, tk.END).strip()
-        if text_content == "请在此输入您的反馈、建议或问题...":
+        if self.text_widget is None or self._placeholder_active:
             text_content = ""
+        else:
+            text_content = self.text_widget.get(1.0, tk.END).strip()
 
         # 检查是否有内容
         has_text = bool(text_content)
         has_images = bool(self.selected_images)
 
         if not has_text and not has_images:
-            messagebox.showwarning("警告", "请至少提供文字反馈或图片反馈")
+            message = "请至少选择一张图片" if self.images_only else "请至少提供文字反馈或图片反馈"
+            messagebox.showwarning("警告", message, parent=self.root)
+            return
+
+        # 准备结果数据 - 多张图片的读取/PNG编码在线程池中并行进行（文件IO和zlib都会释放GIL），
+        # 界面线程不等待结果，而是轮询到全部完成后再组装
+        loads = [(img, self._io_pool.submit(_load_image_bytes, img)) for img in self.selected_images]
+        self._finish_submit(text_content, loads)
+
+    def _finish_submit(self, text_content, loads):
+        """图片数据全部准备好后组装结果并关闭对话框"""
+        if not all(load.done() for _, load in loads):
+            self._submit_wait_id = self.root.after(LOAD_POLL_MS, self._finish_submit, text_content, loads)
             return
+        self._submit_wait_id = None
+
+        # 一次遍历收集图片字段，空值统一为None
+        images, image_formats, image_sources = [], [], []
+        for img, load in loads:
+            try:
+                image_data, image_format = load.result()
+            except Exception as e:
+                messagebox.showerror("错误", f"无法读取图片 {img['source']}: {str(e)}", parent=self.root)
+                if self.mode == 'single_image':
+                    # 撤销这张图片，让用户重新选择
+                    self._image_keys.discard(img['key'])
+                    self.selected_images.remove(img)
+                return
+            images.append(image_data)
+            image_formats.append(image_format)
+            image_sources.append(img['source'])
 
-        # 准备结果数据
         result = {
             'success': True,
-            'text_feedback': text_content if has_text else None,
-            'images': [img['data'] for img in self.selected_images] if has_images else None,
-            'image_sources': [img['source'] for img in self.selected_images] if has_images else None,
-            'has_text': has_text,
-            'has_images': has_images,
-            'image_count': len(self.selected_images),
+            'text_feedback': text_content or None,
+            'images': images or None,
+            'image_formats': image_formats or None,
+            'image_sources': image_sources or None,
+            'has_text': bool(text_content),
+            'has_images': bool(images),
+            'image_count': len(images),
             'timestamp': datetime.now().isoformat()
         }
 
-        self.result_queue.put(result)
-        self.root.destroy()
+        self._close(result)
+
+    def _submit_after_loads(self):
+        """后台读取完成后继续提交"""
+        self._submit_wait_id = None
+        self.submit_feedback()
 
     def cancel(self):
         """取消操作"""
-        self.result_queue.put({
+        self._close({
             'success': False,
             'message': '用户取消了反馈提交'
         })
-        self.root.destroy()
 
 
 @mcp.tool()
@@ -1704,7 +2253,6 @@ def collect_feedback(work_summary: str = "", timeout_seconds: int = DIALOG_TIMEO
 
     # 添加文字反馈
     if result['has_text']:
-        from mcp.types import TextContent
         feedback_items.append(TextContent(
             type="text",
             text=f"用户文字反馈：{result['text_feedback']}\n提交时间：{result['timestamp']}"
@@ -1712,84 +2260,51 @@ def collect_feedback(work_summary: str = "", timeout_seconds: int = DIALOG_TIMEO
 
     # 添加图片反馈
     if result['has_images']:
-        for image_data, source in zip(result['images'], result['image_sources']):
-            feedback_items.append(MCPImage(data=image_data, format='png'))
+        for image_data, image_format in zip(result['images'], result['image_formats']):
+            feedback_items.append(MCPImage(data=image_data, format=image_format))
 
     return feedback_items
 
 
 @mcp.tool()
-def pick_image() -> MCPImage:
+def pick_image(timeout_seconds: int = DIALOG_TIMEOUT) -> MCPImage:
     """
     弹出图片选择对话框，让用户选择图片文件或从剪贴板粘贴图片。
     用户可以选择本地图片文件，或者先截图到剪贴板然后粘贴。
-    """
-    # 使用简化的对话框只选择图片
-    dialog = FeedbackDialog()
-    dialog.work_summary = "请选择一张图片"
-
-    # 创建简化版本的图片选择对话框
-    def simple_image_dialog():
-        root = tk.Tk()
-        root.title("选择图片")
-        root.geometry("400x300")
-        root.resizable(False, False)
-        root.eval('tk::PlaceWindow . center')
-
-        selected_image = {'data': None}
-
-        def select_file():
-            file_path = filedialog.askopenfilename(
-                title="选择图片文件",
-                filetypes=[("图片文件", "*.png *.jpg *.jpeg *.gif *.bmp *.webp")]
-            )
-            if file_path:
-                try:
-                    with open(file_path, 'rb') as f:
-                        selected_image['data'] = f.read()
-                    root.destroy()
-                except Exception as e:
-                    messagebox.showerror("错误", f"无法读取图片: {e}")
 
-        def paste_clipboard():
-            try:
-                from PIL import ImageGrab
-                img = ImageGrab.grabclipboard()
-                if img:
-                    buffer = io.BytesIO()
-                    img.save(buffer, format='PNG')
-                    selected_image['data'] = buffer.getvalue()
-                    root.destroy()
-                else:
-                    messagebox.showwarning("警告", "剪贴板中没有图片")
-            except Exception as e:
-                messagebox.showerror("错误", f"剪贴板操作失败: {e}")
+    Args:
+        timeout_seconds: 对话框超时时间（秒），默认300秒（5分钟）
+    """
+    # 复用反馈对话框的图片选择区域，添加图片后自动提交
+    dialog = FeedbackDialog(work_summary="请选择一张图片", timeout_seconds=timeout_seconds, mode="single_image")
+    result = dialog.show_dialog()
 
-        def cancel():
-            root.destroy()
+    if not result or not result['success']:
+        raise Exception("未选择图片或操作被取消")
 
-        # 界面
-        tk.Label(root, text="请选择图片来源", font=("Arial", 14, "bold")).pack(pady=20)
+    return MCPImage(data=result['images'][0], format=result['image_formats'][0])
 
-        btn_frame = tk.Frame(root)
-        btn_frame.pack(pady=20)
 
-        tk.Button(btn_frame, text="📁 选择图片文件", font=("Arial", 12),
-                 width=20, height=2, command=select_file).pack(pady=10)
-        tk.Button(btn_frame, text="📋 从剪贴板粘贴", font=("Arial", 12),
-                 width=20, height=2, command=paste_clipboard).pack(pady=10)
-        tk.Button(btn_frame, text="❌ 取消", font=("Arial", 12),
-                 width=20, height=1, command=cancel).pack(pady=10)
+@mcp.tool()
+def pick_images(timeout_seconds: int = DIALOG_TIMEOUT) -> list:
+    """
+    弹出图片选择对话框，让用户一次选择多张图片文件或从剪贴板粘贴多张图片。
 
-        root.mainloop()
-        return selected_image['data']
+    Args:
+        timeout_seconds: 对话框超时时间（秒），默认300秒（5分钟）
 
-    image_data = simple_image_dialog()
+    Returns:
+        用户选择的图片列表，顺序与添加顺序一致
+    """
+    # 复用反馈对话框的图片选择区域，文件对话框支持多选，点击提交后返回
+    dialog = FeedbackDialog(work_summary="请选择一张或多张图片", timeout_seconds=timeout_seconds, mode="multi_image")
+    result = dialog.show_dialog()
 
-    if image_data is None:
+    if not result or not result['success']:
         raise Exception("未选择图片或操作被取消")
 
-    return MCPImage(data=image_data, format='png')
+    return [MCPImage(data=image_data, format=image_format)
+            for image_data, image_format in zip(result['images'], result['image_formats'])]
 
 
 @mcp.tool()
@@ -1802,19 +2317,34 @@ def get_image_info(image_path: str) -> str:
     """
     try:
         path = Path(image_path)
-        if not path.exists():
-            return f"文件不存在: {image_path}"
 
-        with Image.open(path) as img:
-            info = {
-                "文件名": path.name,
-                "格式": img.format,
-                "尺寸": f"{img.width} x {img.height}",
-                "模式": img.mode,
-                "文件大小": f"{path.stat().st_size / 1024:.1f} KB"
-            }
+        # 只打开一次文件：文件大小用fstat获取，常见格式只读取文件头，其余格式用同一个文件对象回退到PIL
+        try:
+            f = open(path, 'rb')
+        except FileNotFoundError:
+            return f"文件不存在: {image_path}"
+        with f:
+            file_size = os.fstat(f.fileno()).st_size
+            header = _read_image_header(f)
+            if header is None:
+                from PIL import Image, UnidentifiedImageError
 
-        return "\n".join([f"{k}: {v}" for k, v in info.items()])
+                f.seek(0)
+                try:
+                    with Image.open(f) as img:
+                        header = (img.format, img.width, img.height, img.mode)
+                except UnidentifiedImageError:
+                    # 传入的是文件对象，PIL的错误信息里只有对象的repr，改为报告文件路径
+                    raise UnidentifiedImageError(f"cannot identify image file {os.fspath(path)!r}") from None
+        image_format, width, height, mode = header
+
+        return (
+            f"文件名: {path.name}\n"
+            f"格式: {image_format}\n"
+            f"尺寸: {width} x {height}\n"
+            f"模式: {mode}\n"
+            f"文件大小: {file_size / 1024:.1f} KB"
+        )
 
     except Exception as e:
         return f"获取图片信息失败: {str(e)}"